@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
 import html
 import re
-from datetime import date, datetime, timedelta
+from collections.abc import Collection, Iterator
+from datetime import date, datetime
+from functools import partial
 from urllib.parse import urljoin
-from urllib.request import Request, urlopen
+
+import backfill
+import crawl_state
+import extraction_cache
+import feed_record
+import fetch_stage
+import html_text
+import http_cache
+import metrics
+import timestamps
 
 BASE_URL = "https://andonlabs.com"
 BLOG_INDEX_URL = f"{BASE_URL}/blog"
@@ -12,18 +23,15 @@ REQUEST_TIMEOUT_SECONDS = 30
 WINDOW_DAYS = 30
 
 OUTPUT_BASENAME = "andon_labs_blog"
-FIELDS = ["title", "url", "date", "content"]
-
-LISTING_PATTERN = re.compile(
-    r'<article[^>]*>.*?<a href="([^"]+)"[^>]*>(.*?)</a>.*?<time>(.*?)</time>.*?</article>',
-    re.DOTALL,
-)
+FIELDS = ["title", "url", "date", "published_at", "content"]
+# Bump when _parse_article_content changes to invalidate its cached extractions.
+EXTRACTOR_VERSION = 1
+# The prose region is not known to end at a fixed tag, so article pages are only capped in size.
+ARTICLE_MAX_BYTES = 2 * 1024 * 1024
 
 
-def _fetch_html(url: str) -> str:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
-        return response.read().decode("utf-8", errors="replace")
+def _fetch_html(url: str, policy: http_cache.CachePolicy = http_cache.FEED_POLICY, max_body_bytes: int | None = None) -> str:
+    return http_cache.fetch_text(url, USER_AGENT, REQUEST_TIMEOUT_SECONDS, policy, max_body_bytes=max_body_bytes)
 
 
 def _clean_text(text: str) -> str:
@@ -42,31 +50,81 @@ def _parse_post_date(date_text: str) -> date | None:
     return None
 
 
-def _in_last_window(date_text: str) -> bool:
-    post_day = _parse_post_date(date_text)
-    if post_day is None:
-        return False
+def _listing_entry(blog_index_html: str, start: int, end: int) -> tuple[str, str, str] | None:
+    """The first `<a href="...">title</a>` in `[start, end)` that is followed by a `<time>`, if any.
+
+    Every str.find moves forward from the previous one, so a card is read once however many links it
+    has. If the first link has no `</a>` and `<time>` after it, no later link in the card can have one.
+    """
+    position = start
+    while (link_start := blog_index_html.find('<a href="', position, end)) != -1:
+        href_start = link_start + len('<a href="')
+        href_end = blog_index_html.find('"', href_start, end)
+        if href_end == -1:
+            return None
+        if href_end == href_start:
+            position = href_start
+            continue
+        tag_end = blog_index_html.find(">", href_end, end)
+        link_end = blog_index_html.find("</a>", tag_end + 1, end) if tag_end != -1 else -1
+        time_start = blog_index_html.find("<time>", link_end + len("</a>"), end) if link_end != -1 else -1
+        time_end = blog_index_html.find("</time>", time_start + len("<time>"), end) if time_start != -1 else -1
+        if time_end == -1:
+            return None
+        return (
+            blog_index_html[href_start:href_end],
+            blog_index_html[tag_end + 1 : link_end],
+            blog_index_html[time_start + len("<time>") : time_end],
+        )
+    return None
 
-    end_day = date.today()
-    start_day = end_day - timedelta(days=WINDOW_DAYS - 1)
-    return start_day <= post_day <= end_day
 
+def _iter_listing_entries(blog_index_html: str) -> Iterator[tuple[str, str, str]]:
+    """Yield (href, title_html, date_text) for each `<article>` with a link followed by a `<time>`."""
+    position = 0
+    while (article_start := blog_index_html.find("<article", position)) != -1:
+        tag_end = blog_index_html.find(">", article_start)
+        article_end = blog_index_html.find("</article>", tag_end) if tag_end != -1 else -1
+        if article_end == -1:
+            return
+        entry = _listing_entry(blog_index_html, tag_end + 1, article_end)
+        if entry is not None:
+            yield entry
+        position = article_end + len("</article>")
+
+
+def _reaches_window_start(blog_index_html: str) -> bool:
+    """Whether the page lists any post older than the window, so older pages need not be fetched."""
+    start_day, _ = backfill.window_bounds(WINDOW_DAYS)
+    post_days = (_parse_post_date(_clean_text(date_text.strip())) for _, _, date_text in _iter_listing_entries(blog_index_html))
+    return any(post_day is not None and post_day < start_day for post_day in post_days)
 
-def _parse_listing(blog_index_html: str) -> list[dict[str, str]]:
-    posts: list[dict[str, str]] = []
-    seen_urls: set[str] = set()
 
-    for match in LISTING_PATTERN.finditer(blog_index_html):
-        relative_url = match.group(1).strip()
-        title = _clean_text(re.sub(r"<[^>]+>", " ", match.group(2)))
-        date = _clean_text(match.group(3).strip())
+def _parse_listing(blog_index_html: str) -> list[feed_record.Record]:
+    posts: list[feed_record.Record] = []
+    seen_urls: set[str] = set()
+    start_day, end_day = backfill.window_bounds(WINDOW_DAYS)
+    # Date text -> published_at, or None outside the window; listings repeat dates, so each is parsed once.
+    published_by_date: dict[str, str | None] = {}
+
+    for href, title_html, date_text in _iter_listing_entries(blog_index_html):
+        relative_url = href.strip()
+        title = _clean_text(re.sub(r"<[^>]+>", " ", title_html))
+        date = _clean_text(date_text.strip())
         url = urljoin(BASE_URL, relative_url)
 
-        if not title or url in seen_urls or not _in_last_window(date):
+        if not title or url in seen_urls:
+            continue
+        if date not in published_by_date:
+            post_day = _parse_post_date(date)
+            in_window = post_day is not None and start_day <= post_day <= end_day
+            published_by_date[date] = timestamps.utc_iso(post_day) if in_window else None
+        published_at = published_by_date[date]
+        if published_at is None:
             continue
 
         seen_urls.add(url)
-        posts.append({"title": title, "url": url, "date": date})
+        posts.append(feed_record.Record("andon_labs", title, url, date, published_at))
 
     return posts
 
@@ -81,27 +139,58 @@ def _parse_article_content(article_html: str) -> str:
     if footer_index != -1:
         article_html = article_html[:footer_index]
 
-    article_html = re.sub(r"(?is)<(script|style|noscript|svg).*?>.*?</\1>", " ", article_html)
-    article_html = re.sub(r"(?is)<!--.*?-->", " ", article_html)
-    article_html = re.sub(r"(?is)<br\s*/?>", "\n", article_html)
-    article_html = re.sub(r"(?is)</(p|div|li|h1|h2|h3|h4|h5|h6|tr|ul|ol|blockquote)>", "\n", article_html)
-
-    text = re.sub(r"(?is)<[^>]+>", " ", article_html)
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    return _clean_text(text)
-
-
-def run() -> list[dict[str, str]]:
-    blog_index_html = _fetch_html(BLOG_INDEX_URL)
-    posts = _parse_listing(blog_index_html)
+    # The Andon Labs cleaner has always decoded entities after stripping tags.
+    return html_text.html_to_text(article_html, skip_hidden=True, entities_before_tags=False)
+
+
+def run(fields: Collection[str] | None = None) -> list[feed_record.Record]:
+    with metrics.stage("andon_labs", "fetch"):
+        blog_index_html = _fetch_html(BLOG_INDEX_URL)
+    with metrics.stage("andon_labs", "parse"):
+        posts = _parse_listing(blog_index_html)
+        if backfill.RANGE is not None and not _reaches_window_start(blog_index_html):
+            seen_urls = {post.url for post in posts}
+            for page_html in backfill.older_pages(BLOG_INDEX_URL, blog_index_html, _fetch_html, "andon_labs"):
+                for post in _parse_listing(page_html):
+                    if post.url not in seen_urls:
+                        seen_urls.add(post.url)
+                        posts.append(post)
+                if _reaches_window_start(page_html):
+                    break
 
     if not posts:
-        raise RuntimeError(f"No Andon Labs blog posts found in the last {WINDOW_DAYS} days.")
-
-    for index, post in enumerate(posts, start=1):
-        print(f"[andon_labs] [{index}/{len(posts)}] Fetching content: {post['url']}")
-        article_html = _fetch_html(post["url"])
-        post["content"] = _parse_article_content(article_html)
+        raise RuntimeError(f"No Andon Labs blog posts found {backfill.window_label(WINDOW_DAYS)}.")
+
+    if fields is not None and "content" not in fields:
+        print(f"[andon_labs] Metadata only: {len(posts)} posts, article pages skipped")
+        return posts
+
+    state = crawl_state.CrawlState("andon_labs")
+    pending: list[tuple[feed_record.Record, str]] = []
+    for post in posts:
+        post_fingerprint = crawl_state.fingerprint(post.title, post.date)
+        stored_content = state.lookup(post.url, post_fingerprint)
+        if stored_content is None:
+            pending.append((post, post_fingerprint))
+        else:
+            post.content = stored_content
+    print(f"[andon_labs] Reusing {len(posts) - len(pending)} stored articles, fetching {len(pending)}")
+
+    with metrics.stage("andon_labs", "fetch"):
+        article_pages = fetch_stage.fetch_pages(
+            [post.url for post, _ in pending],
+            partial(_fetch_html, policy=http_cache.ARTICLE_POLICY, max_body_bytes=ARTICLE_MAX_BYTES),
+            "andon_labs",
+        )
+    article_contents = extraction_cache.extract_many("andon_labs", EXTRACTOR_VERSION, article_pages, _parse_article_content)
+    for (post, post_fingerprint), article_content in zip(pending, article_contents):
+        if article_content is None:
+            # Leave the content empty and retry the page on the next run.
+            post.content = ""
+            continue
+        post.content = article_content
+        state.remember(post.url, post_fingerprint, post.content)
+    state.save()
 
-    print(f"[andon_labs] Parsed {len(posts)} posts from last {WINDOW_DAYS} days")
+    print(f"[andon_labs] Parsed {len(posts)} posts {backfill.window_label(WINDOW_DAYS)}")
     return posts
@@ -1,117 +1,114 @@
 #!/usr/bin/env python3
-import html
-import re
-from datetime import date, timedelta
-from email.utils import parsedate_to_datetime
-from urllib.request import Request, urlopen
-from xml.etree import ElementTree as ET
+from collections.abc import Collection
+
+import backfill
+import crawl_state
+import extraction_cache
+import feed_reader
+import feed_record
+import fetch_stage
+import html_text
+import http_cache
+import metrics
 
 FEED_URL = "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_news.xml"
 USER_AGENT = "Mozilla/5.0 (compatible; DataGatherer/1.0; +https://example.local)"
 REQUEST_TIMEOUT_SECONDS = 30
 WINDOW_DAYS = 30
+# The feed is newest-first, so this many consecutive items older than the window end the scan.
+STOP_AFTER_OUT_OF_WINDOW = 10
 
 OUTPUT_BASENAME = "anthropic_news_feed"
-FIELDS = ["title", "url", "date", "content"]
+FIELDS = ["title", "url", "date", "published_at", "content"]
+# Part of the extraction cache key; bump it whenever _extract_article_content changes.
+EXTRACTOR_VERSION = 2
+# Article pages are read only up to the end of their <article>/<main> region, and never past this.
+ARTICLE_MAX_BYTES = 2 * 1024 * 1024
 
 
-def _fetch_text(url: str) -> str:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
-        return response.read().decode("utf-8", errors="replace")
+def _fetch_text(url: str, policy: http_cache.CachePolicy = http_cache.FEED_POLICY) -> str:
+    return http_cache.fetch_text(url, USER_AGENT, REQUEST_TIMEOUT_SECONDS, policy)
+
+
+def _fetch_article(url: str) -> str:
+    return http_cache.fetch_text(
+        url,
+        USER_AGENT,
+        REQUEST_TIMEOUT_SECONDS,
+        http_cache.ARTICLE_POLICY,
+        stop_at=html_text.ArticleRegionEnd,
+        max_body_bytes=ARTICLE_MAX_BYTES,
+    )
 
 
 def _clean_text(text: str) -> str:
-    text = html.unescape(text)
-    text = re.sub(r"(?is)<br\s*/?>", "\n", text)
-    text = re.sub(r"(?is)</(p|div|li|h1|h2|h3|h4|h5|h6|tr|ul|ol|blockquote|section|article)>", "\n", text)
-    text = re.sub(r"(?is)<[^>]+>", " ", text)
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
-
-
-def _in_last_window(pub_date_text: str) -> bool:
-    if not pub_date_text:
-        return False
-    try:
-        pub_dt = parsedate_to_datetime(pub_date_text)
-    except (TypeError, ValueError):
-        return False
-
-    pub_day = pub_dt.date()
-    end_day = date.today()
-    start_day = end_day - timedelta(days=WINDOW_DAYS - 1)
-    return start_day <= pub_day <= end_day
+    return html_text.html_to_text(text, html_text.ARTICLE_BLOCK_TAGS)
 
 
 def _extract_article_content(article_html: str) -> str:
-    html_text = article_html
-
     # Prefer the article region when available to avoid nav/footer text.
-    article_start = html_text.lower().find("<article")
-    if article_start != -1:
-        article_end = html_text.lower().find("</article>", article_start)
-        if article_end != -1:
-            html_text = html_text[article_start : article_end + len("</article>")]
-        else:
-            html_text = html_text[article_start:]
-    else:
-        main_start = html_text.lower().find("<main")
-        if main_start != -1:
-            main_end = html_text.lower().find("</main>", main_start)
-            if main_end != -1:
-                html_text = html_text[main_start : main_end + len("</main>")]
-            else:
-                html_text = html_text[main_start:]
-
-    html_text = re.sub(r"(?is)<(script|style|noscript|svg).*?>.*?</\1>", " ", html_text)
-    html_text = re.sub(r"(?is)<!--.*?-->", " ", html_text)
-    text = _clean_text(html_text)
+    article_region = html_text.article_region(article_html)
+    text = html_text.html_to_text(article_region, html_text.ARTICLE_BLOCK_TAGS, skip_hidden=True)
 
     # Drop very short/empty parses so callers can choose a fallback.
     return text if len(text) >= 40 else ""
 
 
-def run() -> list[dict[str, str]]:
-    xml_text = _fetch_text(FEED_URL)
-    root = ET.fromstring(xml_text)
-
-    channel = root.find("channel")
-    if channel is None:
-        raise RuntimeError("Could not find RSS channel in Anthropic news feed.")
-
-    candidates: list[dict[str, str]] = []
-    for item in channel.findall("item"):
-        title = item.findtext("title", default="").strip()
-        url = item.findtext("link", default="").strip()
-        pub_date = item.findtext("pubDate", default="").strip()
-        description = _clean_text(item.findtext("description", default=""))
-
-        if not title or not url or not _in_last_window(pub_date):
-            continue
-
-        candidates.append(
-            {
-                "title": _clean_text(title),
-                "url": url,
-                "date": pub_date,
-                "content": description,
-            }
-        )
+def run(fields: Collection[str] | None = None) -> list[feed_record.Record]:
+    with metrics.stage("anthropic_news", "fetch"):
+        xml_text = _fetch_text(FEED_URL)
+
+    candidates: list[feed_record.Record] = []
+    with metrics.stage("anthropic_news", "parse"):
+        for item in feed_reader.iter_paged_window_items(
+            xml_text, FEED_URL, _fetch_text, "Anthropic news feed", WINDOW_DAYS, STOP_AFTER_OUT_OF_WINDOW
+        ):
+            candidates.append(
+                feed_record.Record(
+                    "anthropic_news",
+                    _clean_text(item.title),
+                    item.url,
+                    item.pub_date,
+                    item.published_at,
+                    _clean_text(item.description),
+                )
+            )
 
     if not candidates:
-        raise RuntimeError(f"No Anthropic news entries found in the last {WINDOW_DAYS} days.")
-
-    records: list[dict[str, str]] = []
-    for index, item in enumerate(candidates, start=1):
-        print(f"[anthropic_news] [{index}/{len(candidates)}] Fetching content: {item['url']}")
-        article_html = _fetch_text(item["url"])
-        article_content = _extract_article_content(article_html)
+        raise RuntimeError(f"No Anthropic news entries found {backfill.window_label(WINDOW_DAYS)}.")
+
+    if fields is not None and "content" not in fields:
+        # The RSS description stands in for the content; no article page is fetched.
+        print(f"[anthropic_news] Metadata only: {len(candidates)} feed items, article pages skipped")
+        return candidates
+
+    state = crawl_state.CrawlState("anthropic_news")
+    pending: list[tuple[feed_record.Record, str]] = []
+    for item in candidates:
+        item_fingerprint = crawl_state.fingerprint(item.title, item.date, item.content)
+        stored_content = state.lookup(item.url, item_fingerprint)
+        if stored_content is None:
+            pending.append((item, item_fingerprint))
+        else:
+            item.content = stored_content
+    print(f"[anthropic_news] Reusing {len(candidates) - len(pending)} stored articles, fetching {len(pending)}")
+
+    with metrics.stage("anthropic_news", "fetch"):
+        article_pages = fetch_stage.fetch_pages(
+            [item.url for item, _ in pending],
+            _fetch_article,
+            "anthropic_news",
+        )
+    article_contents = extraction_cache.extract_many("anthropic_news", EXTRACTOR_VERSION, article_pages, _extract_article_content)
+    for (item, item_fingerprint), article_content in zip(pending, article_contents):
+        if article_content is None:
+            # Keep the RSS description and retry the page on the next run.
+            continue
+        # Keep the RSS description when the article page is too thin to parse.
         if article_content:
-            item["content"] = article_content
-        records.append(item)
+            item.content = article_content
+        state.remember(item.url, item_fingerprint, item.content)
+    state.save()
 
-    print(f"[anthropic_news] Parsed {len(records)} feed items from last {WINDOW_DAYS} days")
-    return records
+    print(f"[anthropic_news] Parsed {len(candidates)} feed items {backfill.window_label(WINDOW_DAYS)}")
+    return candidates
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import re
+from collections.abc import Callable, Iterator
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urljoin
+
+import crawl_state
+import fetch_policy
+import http_cache
+
+CHECKPOINT_DIR = Path(".cache") / "backfill"
+# Pages followed past a source's first feed or listing page before a backfill gives up on reaching its start.
+MAX_PAGES = 500
+# Requests to one host start at least this far apart during a backfill (four per second).
+HOST_INTERVAL_SECONDS = 0.25
+
+# Inclusive (since, until) days of the running backfill; None outside one.
+RANGE: tuple[date, date] | None = None
+# (module, attribute, value before start()) for each setting start() switched, so finish() can put it back.
+_switched: list[tuple[object, str, object]] = []
+
+LINK_TAG_PATTERN = re.compile(r"<(?:atom:)?(?:link|a)\b[^>]*>", re.IGNORECASE)
+REL_NEXT_PATTERN = re.compile(r"""\brel\s*=\s*["']?(?:[^"'>]*\s)?next\b""", re.IGNORECASE)
+HREF_PATTERN = re.compile(r"""\bhref\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+
+def window_bounds(window_days: int) -> tuple[date, date]:
+    """Return the inclusive (start_day, end_day): the backfill range, or a rolling window ending today."""
+    if RANGE is not None:
+        return RANGE
+    end_day = date.today()
+    return end_day - timedelta(days=window_days - 1), end_day
+
+
+def window_label(window_days: int) -> str:
+    if RANGE is not None:
+        return f"between {RANGE[0].isoformat()} and {RANGE[1].isoformat()}"
+    return f"in the last {window_days} days"
+
+
+def start(since: date, until: date) -> Path:
+    """Switch the process to a backfill of [since, until] and return that range's checkpoint directory.
+
+    Pages are cached pinned in the checkpoint directory and article content goes to a crawl state of its
+    own there, so rerunning the same range after an interruption fetches only what is still missing.
+    """
+    global RANGE
+    finish()
+    RANGE = (since, until)
+    directory = CHECKPOINT_DIR / f"{since.isoformat()}_{until.isoformat()}"
+    settings = [
+        (http_cache, "CACHE_DIR", directory / "http"),
+        (http_cache, "PINNED", True),
+        (crawl_state, "STATE_DIR", directory / "crawl_state"),
+        (fetch_policy, "HOST_INTERVAL_SECONDS", HOST_INTERVAL_SECONDS),
+    ]
+    for module, name, value in settings:
+        _switched.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+    return directory
+
+
+def finish() -> None:
+    """Leave the backfill started by start(), if any, and restore the settings it switched."""
+    global RANGE
+    RANGE = None
+    while _switched:
+        module, name, value = _switched.pop()
+        setattr(module, name, value)
+
+
+def next_page_url(markup: str, base_url: str) -> str | None:
+    """Return the rel="next" link of a feed (an RFC 5005 atom:link) or an HTML page (<link> or <a>), if any."""
+    for tag in LINK_TAG_PATTERN.finditer(markup):
+        if REL_NEXT_PATTERN.search(tag.group(0)) is None:
+            continue
+        href = HREF_PATTERN.search(tag.group(0))
+        if href is not None:
+            return urljoin(base_url, href.group(1).replace("&amp;", "&"))
+    return None
+
+
+def older_pages(url: str, body: str, fetch: Callable[[str], str], label: str) -> Iterator[str]:
+    """During a backfill, fetch and yield the pages that follow `body` through rel="next" links.
+
+    Yields nothing outside a backfill. The caller stops iterating once a page reaches back past the range.
+    """
+    if RANGE is None:
+        return
+    seen_urls = {url}
+    while (url := next_page_url(body, url)) is not None and url not in seen_urls:
+        if len(seen_urls) > MAX_PAGES:
+            print(f"[{label}] Stopping after {MAX_PAGES} older pages")
+            return
+        seen_urls.add(url)
+        print(f"[{label}] Fetching page {len(seen_urls)}: {url}")
+        body = fetch(url)
+        yield body
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare full-body and bounded (stop at </article>) article page fetches against a local stand-in.
+
+Usage: python3 benchmarks/bench_article_stream.py [--pages N] [--trailer-kb N] [--latency-ms MS] [--json]
+
+Pages are shaped like script-heavy x.ai/anthropic.com article pages: a modest <article> followed by
+`--trailer-kb` of inline framework payload scripts. Each mode fetches every page with the HTTP cache off
+and extracts it with the xAI extractor, and reports bytes received, wall time and the tracemalloc peak
+of a single fetch-and-extract. Both modes must extract identical text.
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fixture_server  # noqa: E402
+import http_cache  # noqa: E402
+import http_client  # noqa: E402
+import xai_news_scraper  # noqa: E402
+
+SITE = "https://x.ai"
+
+
+def heavy_page(rnd: random.Random, index: int, trailer_kb: int) -> bytes:
+    paragraphs = "".join(f"<p>Paragraph {paragraph} of post {index}: {'lorem ipsum ' * rnd.randint(10, 40)}</p>" for paragraph in range(30))
+    payload = "".join(
+        f'<script>self.__next_f.push([1,"{"x" * 4096}"])</script>' for _ in range(max(1, trailer_kb // 4))
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Post {index}</title><script>var config = {{}};</script></head>"
+        f'<body><nav><a href="/">Home</a></nav><main><article><h1>Post {index}</h1>{paragraphs}</article></main>'
+        f"<footer>Products Resources</footer>{payload}</body></html>"
+    ).encode("utf-8")
+
+
+def fetch_all(urls: list[str], bounded: bool) -> tuple[list[str], float, int]:
+    fetch = xai_news_scraper._fetch_article if bounded else xai_news_scraper._fetch_html
+    bytes_before = sum(http_client.bytes_downloaded().values())
+    started = time.perf_counter()
+    texts = [xai_news_scraper._extract_article_content(fetch(url)) for url in urls]
+    elapsed = time.perf_counter() - started
+    return texts, elapsed, sum(http_client.bytes_downloaded().values()) - bytes_before
+
+
+def peak_kib(url: str, bounded: bool) -> float:
+    fetch = xai_news_scraper._fetch_article if bounded else xai_news_scraper._fetch_html
+    tracemalloc.start()
+    try:
+        xai_news_scraper._extract_article_content(fetch(url))
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--trailer-kb", type=int, default=1024, help="inline script payload after </article> per page")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency injected into every request")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(1)
+    fixtures = {f"{SITE}/news/post-{index}": heavy_page(rnd, index, args.trailer_kb) for index in range(args.pages)}
+    http_cache.CACHE_ENABLED = False
+    results = {"pages": args.pages, "page_kb": round(len(next(iter(fixtures.values()))) / 1024), "modes": {}}
+    with fixture_server.FixtureServer(fixtures) as server:
+        server.control(latency_ms=args.latency_ms)
+        urls = [server.local_url(url) for url in fixtures]
+        texts_by_mode = {}
+        for mode, bounded in (("full", False), ("bounded", True)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                texts, elapsed, received = fetch_all(urls, bounded)
+                peak = peak_kib(urls[0], bounded)
+            texts_by_mode[mode] = texts
+            results["modes"][mode] = {
+                "wall_ms": round(elapsed * 1000, 1),
+                "bytes_received": received,
+                "peak_kib": round(peak, 1),
+            }
+        http_client.close_all()
+    results["identical_text"] = texts_by_mode["full"] == texts_by_mode["bounded"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['pages']} pages of {results['page_kb']} KB, identical text: {results['identical_text']}")
+        for mode, row in results["modes"].items():
+            print(f"  {mode}: {row['bytes_received']} bytes received, {row['wall_ms']:.1f} ms, peak {row['peak_kib']:.0f} KiB per page")
+    return 0 if results["identical_text"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
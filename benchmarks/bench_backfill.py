@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Offline benchmark of a --since/--until backfill: paging, per-host pacing and resuming after an interruption.
+
+Usage: python3 benchmarks/bench_backfill.py [--posts N] [--page-size N] [--days N] [--latency-ms MS]
+                                            [--interrupt-after SECONDS] [--json]
+
+Generated fixtures with `--posts` entries per source (two days apart), split into pages of `--page-size`
+linked by rel="next", are served by fixture_server. Phases:
+- `window`: a normal run, which reads only the first feed and listing pages;
+- `backfill`: a backfill of `--days` days ending 100 days ago, from an empty working directory;
+- `interrupted`: the same backfill in a child process that is killed after `--interrupt-after` seconds;
+- `resume`: the same command rerun in the interrupted run's directory.
+Reported per phase: wall time, requests seen by the stand-in and records written. `resume` must write the
+same records as `backfill`, and `interrupted` plus `resume` must not need more requests than `backfill`.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fixture_server  # noqa: E402
+import main  # noqa: E402
+from bench_scrapers import point_sources_at, quietly  # noqa: E402
+
+
+def _run_in(server: fixture_server.FixtureServer, work_dir: Path, argv: list[str]) -> int:
+    os.chdir(work_dir)
+    config_path = work_dir / "sources.json"
+    point_sources_at(server, config_path)
+    return quietly(main.main, ["--sources-config", str(config_path), "--no-pretty-json", *argv])
+
+
+def _records(work_dir: Path, basename: str) -> list[str]:
+    path = work_dir / "output" / f"{basename}.jsonl"
+    return path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+
+
+def _phase(server: fixture_server.FixtureServer, name: str, work_dir: Path, argv: list[str], basename: str) -> dict:
+    before = server.control()["requests"]
+    started = time.perf_counter()
+    exit_code = _run_in(server, work_dir, argv)
+    return {
+        "phase": name,
+        "exit_code": exit_code,
+        "wall_ms": round((time.perf_counter() - started) * 1000, 1),
+        "requests": server.control()["requests"] - before,
+        "records": len(_records(work_dir, basename)),
+    }
+
+
+def _interrupted(server: fixture_server.FixtureServer, work_dir: Path, argv: list[str], seconds: float) -> dict:
+    before = server.control()["requests"]
+    child = multiprocessing.Process(target=_run_in, args=(server, work_dir, argv))
+    started = time.perf_counter()
+    child.start()
+    child.join(timeout=seconds)
+    finished = not child.is_alive()
+    child.terminate()
+    child.join()
+    return {
+        "phase": "interrupted",
+        "exit_code": child.exitcode if finished else None,
+        "wall_ms": round((time.perf_counter() - started) * 1000, 1),
+        "requests": server.control()["requests"] - before,
+        "records": 0,
+    }
+
+
+def main_cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=300, help="posts per source")
+    parser.add_argument("--page-size", type=int, default=20, help="entries per feed or listing page")
+    parser.add_argument("--days", type=int, default=120, help="length of the backfilled range")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="latency injected into every request")
+    parser.add_argument("--interrupt-after", type=float, default=2.0, help="seconds before the interrupted run is killed")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    until = date.today() - timedelta(days=100)
+    since = until - timedelta(days=args.days - 1)
+    backfill_argv = ["--since", since.isoformat(), "--until", until.isoformat()]
+    backfill_basename = f"{main.COMBINED_OUTPUT_BASENAME}_{since.isoformat()}_{until.isoformat()}"
+
+    fixtures = fixture_server.build_fixtures(args.posts, page_size=args.page_size)
+    original_dir = os.getcwd()
+    with fixture_server.FixtureServer(fixtures) as server, tempfile.TemporaryDirectory() as root:
+        server.control(latency_ms=args.latency_ms)
+        directories = {name: Path(root) / name for name in ("window", "backfill", "resume")}
+        for directory in directories.values():
+            directory.mkdir()
+        try:
+            phases = [_phase(server, "window", directories["window"], [], main.COMBINED_OUTPUT_BASENAME)]
+            phases.append(_phase(server, "backfill", directories["backfill"], backfill_argv, backfill_basename))
+            phases.append(_interrupted(server, directories["resume"], backfill_argv, args.interrupt_after))
+            phases.append(_phase(server, "resume", directories["resume"], backfill_argv, backfill_basename))
+        finally:
+            os.chdir(original_dir)
+        same_records = _records(directories["backfill"], backfill_basename) == _records(directories["resume"], backfill_basename)
+
+    by_phase = {row["phase"]: row for row in phases}
+    results = {
+        "posts": args.posts,
+        "page_size": args.page_size,
+        "since": since.isoformat(),
+        "until": until.isoformat(),
+        "latency_ms": args.latency_ms,
+        "phases": phases,
+        "resume_matches_backfill": same_records,
+        "refetched_requests": by_phase["interrupted"]["requests"] + by_phase["resume"]["requests"] - by_phase["backfill"]["requests"],
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.posts} posts per source, {args.page_size} per page, backfill {since} to {until}:")
+        for row in phases:
+            print(f"  {row['phase']}: exit {row['exit_code']}, {row['wall_ms']:.0f} ms, {row['requests']} requests, {row['records']} records")
+        print(f"resume output matches the uninterrupted backfill: {same_records}")
+        print(f"requests repeated by interrupted + resume over one backfill: {results['refetched_requests']}")
+    return 0 if same_records else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
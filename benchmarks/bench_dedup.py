@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Measure how dedup.Deduplicator scales with the number of records.
+
+Usage: python3 benchmarks/bench_dedup.py [--sizes 1000,5000,20000] [--words N] [--json]
+
+Every synthetic archive holds unique articles plus about 10% near-duplicate copies (a few words changed,
+a tracking-parameter URL) and 5% exact URL variants. Reports the time per record, which stays flat when
+candidate lookup is sub-quadratic, and whether every planted duplicate was caught.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dedup  # noqa: E402
+import feed_record  # noqa: E402
+
+DEFAULT_SIZES = (1000, 5000, 10000, 20000, 40000)
+VOCABULARY = [f"word{index}" for index in range(20000)]
+
+
+def synthetic_records(count: int, words: int, seed: int = 1) -> tuple[list[feed_record.Record], int]:
+    rnd = random.Random(seed)
+    records: list[feed_record.Record] = []
+    planted = 0
+    while len(records) < count:
+        roll = rnd.random()
+        if records and roll < 0.10:
+            original = rnd.choice(records)
+            tokens = original.content.split()
+            for _ in range(max(1, len(tokens) // 100)):
+                tokens[rnd.randrange(len(tokens))] = rnd.choice(VOCABULARY)
+            content = " ".join(tokens)
+            url = f"https://mirror.example/{len(records)}?utm_source=feed"
+            planted += 1
+        elif records and roll < 0.15:
+            original = rnd.choice(records)
+            content = original.content
+            url = original.url.replace("https://", "http://www.") + "/?utm_medium=rss"
+            planted += 1
+        else:
+            content = " ".join(rnd.choice(VOCABULARY) for _ in range(words))
+            url = f"https://source.example/post/{len(records)}"
+        records.append(feed_record.Record("synthetic", f"Post {len(records)}", url, "", "2025-01-01T00:00:00Z", content))
+    return records, planted
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="comma-separated record counts")
+    parser.add_argument("--words", type=int, default=300, help="words per synthetic article")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in (int(size) for size in args.sizes.split(",") if size.strip()):
+        records, planted = synthetic_records(size, args.words)
+        deduplicator = dedup.Deduplicator()
+        started = time.perf_counter()
+        kept = deduplicator.filter(records)
+        elapsed = time.perf_counter() - started
+        results.append(
+            {
+                "records": size,
+                "kept": len(kept),
+                "planted_duplicates": planted,
+                "dropped": len(deduplicator.merges),
+                "seconds": round(elapsed, 3),
+                "us_per_record": round(elapsed / size * 1e6, 1),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results:
+            print(
+                f"{row['records']} records: dropped {row['dropped']} of {row['planted_duplicates']} planted duplicates "
+                f"in {row['seconds']:.2f} s ({row['us_per_record']:.0f} us/record)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Article extraction in process versus through extraction_pool, with and without batching.
+
+Usage: python3 benchmarks/bench_extraction_pool.py [--pages N] [--paragraphs N] [--workers N ...] [--json]
+
+Generates `--pages` article pages (`--paragraphs` paragraphs each, shaped like fixture_server's xAI
+pages) and extracts them with xai_news_scraper._extract_article_content: once in the calling thread,
+then through extraction_pool.map_pages for each `--workers` count, batched by BATCH_BYTES and with one
+page per task. The pool is started and warmed up with MIN_POOL_PAGES pages before timing; `--pages`
+must be at least MIN_POOL_PAGES for the pool to be used at all. Reports wall time, pages
+per second and whether every mode returned the same text. The speedup is bounded by the CPU count.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import extraction_pool  # noqa: E402
+import fixture_server  # noqa: E402
+import xai_news_scraper  # noqa: E402
+
+
+def _timed(function, *args) -> tuple[float, list[str]]:
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def bench_pool(pages: list[str], workers: int, batch_bytes: int, expected: list[str]) -> dict:
+    extraction_pool.WORKERS = workers
+    extraction_pool.BATCH_BYTES = batch_bytes
+    extractor = xai_news_scraper._extract_article_content
+    try:
+        extraction_pool.map_pages(extractor, pages[: extraction_pool.MIN_POOL_PAGES])
+        seconds, contents = _timed(extraction_pool.map_pages, extractor, pages)
+    finally:
+        extraction_pool.shutdown()
+    return {"seconds": round(seconds, 3), "pages_per_s": round(len(pages) / seconds, 1), "identical": contents == expected}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400, help="article pages to extract")
+    parser.add_argument("--paragraphs", type=int, default=60, help="paragraphs per page")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({2, max(2, os.cpu_count() or 1)}), help="pool sizes to try")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(1)
+    pages = [fixture_server._article_page(rnd, f"Post {index}", args.paragraphs, "<p>Try Grok On</p>") for index in range(args.pages)]
+    in_process_seconds, expected = _timed(lambda: [xai_news_scraper._extract_article_content(page) for page in pages])
+
+    results = {
+        "cpu_count": os.cpu_count(),
+        "pages": args.pages,
+        "page_kb": round(sum(map(len, pages)) / len(pages) / 1024, 1),
+        "in_process": {"seconds": round(in_process_seconds, 3), "pages_per_s": round(args.pages / in_process_seconds, 1)},
+        "pool": {},
+    }
+    for workers in args.workers:
+        results["pool"][f"{workers}_workers"] = bench_pool(pages, workers, extraction_pool.BATCH_BYTES, expected)
+        results["pool"][f"{workers}_workers_unbatched"] = bench_pool(pages, workers, 1, expected)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.pages} pages of ~{results['page_kb']} KB on {results['cpu_count']} CPU(s):")
+        print(f"  in process: {in_process_seconds:.2f} s, {results['in_process']['pages_per_s']:.0f} pages/s")
+        for mode, row in results["pool"].items():
+            print(f"  {mode}: {row['seconds']:.2f} s, {row['pages_per_s']:.0f} pages/s, identical: {row['identical']}")
+    return 0 if all(row["identical"] for row in results["pool"].values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
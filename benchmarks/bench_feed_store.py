@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Measure feed_store upserts and date-range/keyword queries on months of accumulated records.
+
+Usage: python3 benchmarks/bench_feed_store.py [--records N] [--days N] [--repeat N] [--json]
+
+The database is built in a temporary directory from synthetic records spread over `--days` days and six
+sources, one upsert transaction per simulated daily run.
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import feed_record  # noqa: E402
+import feed_store  # noqa: E402
+import timestamps  # noqa: E402
+
+SOURCES = ("andon_labs", "technologyreview", "openai_news", "deepmind_blog", "anthropic_news", "xai_news")
+VOCABULARY = [f"term{index}" for index in range(5000)] + ["safety", "agent", "benchmark", "reasoning", "policy"]
+
+
+def synthetic_daily_batches(records: int, days: int, seed: int = 1) -> list[list[feed_record.Record]]:
+    rnd = random.Random(seed)
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    batches: list[list[feed_record.Record]] = [[] for _ in range(days)]
+    for index in range(records):
+        day = index * days // records
+        published = start + timedelta(days=day, seconds=rnd.randrange(86400))
+        content = " ".join(rnd.choice(VOCABULARY) for _ in range(rnd.randint(100, 400)))
+        record = feed_record.Record(
+            rnd.choice(SOURCES),
+            f"Post {index} about {rnd.choice(VOCABULARY)}",
+            f"https://example.com/{index}",
+            published.strftime("%B %d, %Y"),
+            timestamps.utc_iso(published),
+            content,
+        )
+        batches[day].append(record)
+    return batches
+
+
+def _best_ms(function, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(function())
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    batches = synthetic_daily_batches(args.records, args.days)
+    week_ago = timestamps.utc_iso(datetime.now(timezone.utc) - timedelta(days=7))
+    month_ago = timestamps.utc_iso(datetime.now(timezone.utc) - timedelta(days=30))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        connection = feed_store.connect(Path(work_dir) / "feed.sqlite3")
+        started = time.perf_counter()
+        for batch in batches:
+            feed_store.upsert_records(connection, batch)
+        upsert_seconds = time.perf_counter() - started
+        # A rerun of the last day updates rows that already exist.
+        started = time.perf_counter()
+        feed_store.upsert_records(connection, batches[-1])
+        reupsert_ms = (time.perf_counter() - started) * 1000
+
+        queries = {
+            "last_7_days": lambda: feed_store.search(connection, since=week_ago, limit=1000),
+            "keyword": lambda: feed_store.search(connection, "safety agent"),
+            "keyword_last_30_days_one_source": lambda: feed_store.search(connection, "reasoning", since=month_ago, source="openai_news"),
+            "rare_keyword_all_time": lambda: feed_store.search(connection, "term4242 term17", limit=1000),
+        }
+        results = {
+            "records": args.records,
+            "days": args.days,
+            "upsert_records_per_s": round(args.records / upsert_seconds),
+            "reupsert_day_ms": round(reupsert_ms, 2),
+            "queries": {},
+        }
+        for name, query in queries.items():
+            best_ms, rows = _best_ms(query, args.repeat)
+            results["queries"][name] = {"best_ms": round(best_ms, 2), "rows": rows}
+        connection.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{args.records} records over {args.days} days: {results['upsert_records_per_s']} upserts/s, "
+            f"re-upserting one day {results['reupsert_day_ms']:.1f} ms"
+        )
+        for name, row in results["queries"].items():
+            print(f"  {name}: {row['best_ms']:.2f} ms ({row['rows']} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Measure the fetch policy layer against local stand-ins: tail latency with and without hedging, a dead host
+under a run deadline, and a failing host behind the circuit breaker.
+
+Usage: python3 benchmarks/bench_fetch_policy.py [--requests N] [--stall-fraction F] [--stall-ms MS] [--hedge-after-ms MS] [--json]
+
+- tail: `--requests` article fetches from 8 threads sharing the host's PER_HOST_LIMIT slots, from a server that stalls a random `--stall-fraction` of
+  responses by `--stall-ms`; reported with hedging off and on.
+- dead_host: a server that accepts connections and never answers, fetched with the scrapers' 30 s timeout
+  under a `--deadline-s` run budget.
+- failing_host: a server that answers every request with 503; counts how many requests reach it.
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fetch_policy  # noqa: E402
+import fetch_stage  # noqa: E402
+import http_cache  # noqa: E402
+import http_client  # noqa: E402
+import metrics  # noqa: E402
+
+REQUEST_TIMEOUT_SECONDS = 30
+PAGE = b"<html><body><main><article><p>" + b"lorem ipsum " * 2000 + b"</p></article></main></body></html>"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+            stall = server.rnd.random() < server.stall_fraction
+        try:
+            if server.status != 200:
+                self._reply(server.status, b"")
+                return
+            if stall:
+                time.sleep(server.stall_seconds)
+            self._reply(200, PAGE)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@contextlib.contextmanager
+def stand_in(status: int = 200, stall_fraction: float = 0.0, stall_seconds: float = 0.0, seed: int = 1):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.in_flight = 0
+    server.peak_in_flight = 0
+    server.rnd = random.Random(seed)
+    server.status = status
+    server.stall_fraction = stall_fraction
+    server.stall_seconds = stall_seconds
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def fetch_many(urls: list[str], workers: int = 8) -> tuple[list[float], int, float]:
+    """Fetch every URL through the cache layer; returns per-request latencies, failures and wall time."""
+
+    def fetch_one(url: str) -> float | None:
+        # Like fetch_stage.fetch_pages, each fetch holds one of the host's slots; hedges need a slot too.
+        with fetch_stage.host_semaphore(url):
+            started = time.perf_counter()
+            try:
+                http_cache.fetch_bytes(url, "bench", REQUEST_TIMEOUT_SECONDS, http_cache.ARTICLE_POLICY)
+            except Exception:
+                return None
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(fetch_one, urls))
+    latencies = sorted(result for result in results if result is not None)
+    return latencies, len(results) - len(latencies), time.perf_counter() - started
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def bench_tail(args: argparse.Namespace) -> dict:
+    results = {}
+    for mode, hedge_after in (("unhedged", None), ("hedged", args.hedge_after_ms / 1000)):
+        fetch_policy.HEDGE_AFTER_SECONDS = hedge_after
+        fetch_policy.start_run(None)
+        metrics.reset()
+        with stand_in(stall_fraction=args.stall_fraction, stall_seconds=args.stall_ms / 1000) as (server, base):
+            latencies, failures, wall = fetch_many([f"{base}/post-{index}" for index in range(args.requests)])
+            http_client.close_all()
+            sent = server.requests
+            peak_in_flight = server.peak_in_flight
+        events = metrics.snapshot()["fetch_events"]
+        results[mode] = {
+            "wall_ms": round(wall * 1000, 1),
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000 if latencies else 0.0, 1),
+            "failures": failures,
+            "requests_sent": sent,
+            "peak_in_flight": peak_in_flight,
+            "hedges": sum(host.get("hedge", 0) for host in events.values()),
+        }
+    fetch_policy.HEDGE_AFTER_SECONDS = None
+    return results
+
+
+def bench_dead_host(args: argparse.Namespace) -> dict:
+    # A listening socket that never accepts: connects succeed, reads time out.
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(64)
+    base = f"http://127.0.0.1:{listener.getsockname()[1]}"
+    try:
+        fetch_policy.start_run(args.deadline_s)
+        _, failures, wall = fetch_many([f"{base}/post-{index}" for index in range(16)])
+    finally:
+        fetch_policy.start_run(None)
+        http_client.close_all()
+        listener.close()
+    return {"deadline_s": args.deadline_s, "requests": 16, "failures": failures, "wall_s": round(wall, 2)}
+
+
+def bench_failing_host(args: argparse.Namespace) -> dict:
+    fetch_policy.start_run(None)
+    with stand_in(status=503) as (server, base):
+        _, failures, wall = fetch_many([f"{base}/post-{index}" for index in range(args.requests)])
+        http_client.close_all()
+        sent = server.requests
+    return {"requests": args.requests, "failures": failures, "requests_sent": sent, "wall_s": round(wall, 2)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--stall-fraction", type=float, default=0.02, help="share of responses that stall")
+    parser.add_argument("--stall-ms", type=float, default=2000)
+    parser.add_argument("--hedge-after-ms", type=float, default=100)
+    parser.add_argument("--deadline-s", type=float, default=5, help="run budget for the dead-host scenario")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    http_cache.CACHE_ENABLED = False
+    with contextlib.redirect_stderr(io.StringIO()):
+        results = {
+            "tail": bench_tail(args),
+            "dead_host": bench_dead_host(args),
+            "failing_host": bench_failing_host(args),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"tail: {args.requests} requests, {args.stall_fraction:.0%} stalled by {args.stall_ms:.0f} ms")
+        for mode, row in results["tail"].items():
+            print(
+                f"  {mode}: p50 {row['p50_ms']:.1f} ms, p99 {row['p99_ms']:.1f} ms, max {row['max_ms']:.1f} ms, "
+                f"wall {row['wall_ms']:.0f} ms, {row['requests_sent']} requests sent ({row['hedges']} hedges), "
+                f"at most {row['peak_in_flight']} at once"
+            )
+        dead = results["dead_host"]
+        print(f"dead_host: {dead['failures']}/{dead['requests']} failed in {dead['wall_s']:.2f}s with a {dead['deadline_s']:.0f}s budget")
+        failing = results["failing_host"]
+        print(
+            f"failing_host: {failing['failures']}/{failing['requests']} failed, {failing['requests_sent']} requests "
+            f"reached the host in {failing['wall_s']:.2f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
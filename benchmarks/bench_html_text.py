@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compare html_text.html_to_text against the old regex chain on large article pages.
+
+Usage: python3 benchmarks/bench_html_text.py [--repeat N] [page.html ...]
+
+Without page arguments a synthetic page shaped like the Anthropic/xAI article pages is used:
+large inline scripts around an <article> with many inline tags, comments, svg icons and entities.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import html_text  # noqa: E402
+
+MODES = {
+    "article": {"block_tags": html_text.ARTICLE_BLOCK_TAGS, "skip_hidden": True},
+    "andon_article": {"skip_hidden": True, "entities_before_tags": False},
+    "rss_description": {},
+}
+
+WORDS = (
+    "the model agent safety research claude evaluation training data compute policy "
+    "we are to of and in a is that for it as with on &amp; it&#x27;s &quot;quoted&quot; caf&eacute; &lt;div&gt; x&lt;y"
+).split()
+
+
+def synthetic_article_page(paragraphs: int = 800, seed: int = 1) -> str:
+    rnd = random.Random(seed)
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>Post</title>']
+    for index in range(30):
+        parts.append(f'<script id="s{index}">self.__next_f.push([1,"{"x" * rnd.randint(200, 3000)}"])</script>')
+    parts.append("<style>.a{color:red}</style></head><body><nav><a href=\"/\">Home</a></nav><main><article>")
+    for index in range(paragraphs):
+        sentence = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(20, 80)))
+        parts.append(
+            f'<div class="para-{index}"><p class="body">{sentence} <a href="/x/{index}?a=1&amp;b=2">link</a> '
+            f"<strong>bold</strong> <em>it</em>.</p>\n  \n"
+        )
+        if index % 10 == 0:
+            parts.append(
+                "<h2>Heading &amp; more</h2><ul><li>one</li><li>two<br/>three</li></ul>"
+                '<!-- comment --><svg viewBox="0 0 1 1"><path d="M0 0"/></svg>'
+            )
+        parts.append("</div>")
+    parts.append("</article></main><footer><p>Privacy policy</p></footer>")
+    parts.extend(f'<script>{"y" * 5000}</script>' for _ in range(10))
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def _time_ms(function, markup: str, options: dict, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(markup, **options)
+        samples.append((time.perf_counter() - started) * 1000)
+    return min(samples)
+
+
+def _peak_kib(function, markup: str, options: dict) -> float:
+    tracemalloc.start()
+    try:
+        function(markup, **options)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", type=Path, help="recorded HTML pages to benchmark")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    pages = {str(path): path.read_text(encoding="utf-8", errors="replace") for path in args.pages}
+    if not pages:
+        pages = {"synthetic_article": synthetic_article_page()}
+
+    results = []
+    for page_name, markup in pages.items():
+        for mode, options in MODES.items():
+            expected = html_text.regex_chain_to_text(markup, **options)
+            results.append(
+                {
+                    "page": page_name,
+                    "mode": mode,
+                    "bytes": len(markup.encode("utf-8")),
+                    "identical_output": html_text.html_to_text(markup, **options) == expected,
+                    "regex_chain_best_ms": _time_ms(html_text.regex_chain_to_text, markup, options, args.repeat),
+                    "single_pass_best_ms": _time_ms(html_text.html_to_text, markup, options, args.repeat),
+                    "regex_chain_peak_kib": _peak_kib(html_text.regex_chain_to_text, markup, options),
+                    "single_pass_peak_kib": _peak_kib(html_text.html_to_text, markup, options),
+                }
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results:
+            print(
+                f"{row['page']} [{row['mode']}] {row['bytes']} bytes: "
+                f"regex chain {row['regex_chain_best_ms']:.2f} ms / {row['regex_chain_peak_kib']:.0f} KiB peak, "
+                f"single pass {row['single_pass_best_ms']:.2f} ms / {row['single_pass_peak_kib']:.0f} KiB peak, "
+                f"identical output: {row['identical_output']}"
+            )
+    return 0 if all(row["identical_output"] for row in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Compare the xAI and Andon Labs listing parsers against their previous regex versions.
+
+Usage: python3 benchmarks/bench_listing_parsers.py [--sizes 500,2000,8000] [--repeat N] [--json]
+
+Synthetic listing pages with thousands of entries are generated for each size. The xAI page pads every
+card with inline markup and extra dates, the Andon Labs page ends with a strip of related-post cards that
+have no <time>. The old Andon pattern backtracks through every later link for each of those cards, so its
+cost grows with the cube of the strip length; RELATED_CARDS keeps it small enough to finish.
+`andon_untimed_card` times the current Andon parser alone on a page holding one card with as many links
+as entries and no <time>, the case that makes any regex with lazy spans inside a card blow up.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urljoin
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import andon_labs_scraper  # noqa: E402
+import backfill  # noqa: E402
+import xai_news_scraper  # noqa: E402
+
+DEFAULT_SIZES = (500, 1000, 2000, 4000, 8000)
+RELATED_CARDS = 30
+
+LEGACY_ANDON_LISTING_PATTERN = re.compile(
+    r'<article[^>]*>.*?<a href="([^"]+)"[^>]*>(.*?)</a>.*?<time>(.*?)</time>.*?</article>',
+    re.DOTALL,
+)
+
+
+def _legacy_xai_find_nearest_date(page_html: str, anchor_index: int) -> str:
+    window_start = max(0, anchor_index - 1200)
+    window_end = min(len(page_html), anchor_index + 1200)
+    window = page_html[window_start:window_end]
+
+    best_date = ""
+    best_distance = 10**9
+    for match in xai_news_scraper.DATE_PATTERN.finditer(window):
+        distance = abs((window_start + match.start()) - anchor_index)
+        if distance < best_distance:
+            best_distance = distance
+            best_date = match.group(1)
+    return best_date
+
+
+def legacy_xai_parse_listing(news_html: str) -> list[dict[str, str]]:
+    posts: list[dict[str, str]] = []
+    seen_urls: set[str] = set()
+    for match in xai_news_scraper.LINK_PATTERN.finditer(news_html):
+        relative_url = match.group(1).strip()
+        if relative_url == "/news":
+            continue
+        title = xai_news_scraper._clean_text(match.group(2))
+        if not title or title.upper() == "READ":
+            continue
+        url = urljoin(xai_news_scraper.BASE_URL, relative_url)
+        if url in seen_urls:
+            continue
+        date_text = _legacy_xai_find_nearest_date(news_html, match.start())
+        if not date_text or not xai_news_scraper._in_last_window(date_text):
+            continue
+        seen_urls.add(url)
+        posts.append({"title": title, "url": url, "date": date_text})
+    return posts
+
+
+def _legacy_andon_in_last_window(date_text: str) -> bool:
+    post_day = andon_labs_scraper._parse_post_date(date_text)
+    if post_day is None:
+        return False
+    start_day, end_day = backfill.window_bounds(andon_labs_scraper.WINDOW_DAYS)
+    return start_day <= post_day <= end_day
+
+
+def legacy_andon_parse_listing(blog_index_html: str) -> list[dict[str, str]]:
+    posts: list[dict[str, str]] = []
+    seen_urls: set[str] = set()
+    for match in LEGACY_ANDON_LISTING_PATTERN.finditer(blog_index_html):
+        title = andon_labs_scraper._clean_text(re.sub(r"<[^>]+>", " ", match.group(2)))
+        date_text = andon_labs_scraper._clean_text(match.group(3).strip())
+        url = urljoin(andon_labs_scraper.BASE_URL, match.group(1).strip())
+        if not title or url in seen_urls or not _legacy_andon_in_last_window(date_text):
+            continue
+        seen_urls.add(url)
+        posts.append({"title": title, "url": url, "date": date_text})
+    return posts
+
+
+def synthetic_xai_listing(entries: int) -> str:
+    today = date.today()
+    parts = ['<html><body><nav><a href="/news">News</a></nav><main>']
+    for index in range(entries):
+        day = today - timedelta(days=index % 60)
+        padding = f'<span class="c{index}">' + "<i></i>" * 40 + "</span>"
+        parts.append(
+            f'<div class="card">{padding}<a class="title" href="/news/post-{index}"><h3>Post {index} &amp; more</h3></a>'
+            f"<p>{day.strftime('%B %d, %Y')}</p><p>Updated {(day - timedelta(days=1)).strftime('%B %d, %Y')}</p>"
+            f'{padding}<a href="/news/post-{index}">Read</a></div>'
+        )
+    parts.append("</main></body></html>")
+    return "".join(parts)
+
+
+def synthetic_andon_listing(entries: int) -> str:
+    today = date.today()
+    parts = ["<html><body><main>"]
+    for index in range(entries):
+        day = today - timedelta(days=index % 60)
+        parts.append(
+            f'<article class="post"><a href="/blog/post-{index}" class="t"><h2>Post {index} &amp; notes</h2></a>'
+            f"<p>{'Summary text. ' * 10}</p><time>{day.month}/{day.day}/{day.year}</time></article>"
+        )
+    parts.append("</main><aside>")
+    for index in range(RELATED_CARDS):
+        parts.append(f'<article class="related"><a href="/blog/related-{index}">Related {index}</a></article>')
+    parts.append("</aside></body></html>")
+    return "".join(parts)
+
+
+def synthetic_andon_untimed_card(links: int) -> str:
+    parts = ['<html><body><main><article class="links">']
+    for index in range(links):
+        parts.append(f'<a href="/blog/link-{index}">Link {index}</a> ')
+    parts.append("</article></main></body></html>")
+    return "".join(parts)
+
+
+PARSERS = {
+    "xai_news": (synthetic_xai_listing, legacy_xai_parse_listing, xai_news_scraper._parse_listing),
+    "andon_labs": (synthetic_andon_listing, legacy_andon_parse_listing, andon_labs_scraper._parse_listing),
+}
+
+
+def _without_timestamps(posts: list) -> list[dict[str, str]]:
+    # The old parsers return plain dicts and predate the published_at field.
+    return [{"title": post.title, "url": post.url, "date": post.date} for post in posts]
+
+
+def _time_ms(function, page: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(page)
+        samples.append((time.perf_counter() - started) * 1000)
+    return min(samples)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="comma-separated entry counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = []
+    for source, (build_page, legacy_parse, parse) in PARSERS.items():
+        for entries in sizes:
+            page = build_page(entries)
+            results.append(
+                {
+                    "source": source,
+                    "entries": entries,
+                    "bytes": len(page.encode("utf-8")),
+                    "identical_output": _without_timestamps(parse(page)) == legacy_parse(page),
+                    "legacy_best_ms": _time_ms(legacy_parse, page, args.repeat),
+                    "single_pass_best_ms": _time_ms(parse, page, args.repeat),
+                }
+            )
+    for entries in sizes:
+        page = synthetic_andon_untimed_card(entries)
+        results.append(
+            {
+                "source": "andon_untimed_card",
+                "entries": entries,
+                "bytes": len(page.encode("utf-8")),
+                "identical_output": andon_labs_scraper._parse_listing(page) == [],
+                "legacy_best_ms": None,
+                "single_pass_best_ms": _time_ms(andon_labs_scraper._parse_listing, page, args.repeat),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results:
+            legacy = f"legacy {row['legacy_best_ms']:.1f} ms, " if row["legacy_best_ms"] is not None else ""
+            print(
+                f"{row['source']} {row['entries']} entries ({row['bytes']} bytes): "
+                f"{legacy}single pass {row['single_pass_best_ms']:.1f} ms, "
+                f"identical output: {row['identical_output']}"
+            )
+    return 0 if all(row["identical_output"] for row in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Overhead of main.py's profiling modes on an offline cold run.
+
+Usage: python3 benchmarks/bench_profiling.py [--posts N] [--repeat N] [--json]
+
+Runs main.main with --no-cache --full-crawl against fixture_server's stand-in without injected latency,
+so the run is CPU-bound and overhead is not hidden behind network waits. Modes: `off`, `sample` and
+`sample_1ms` (--profile-sample at the default 10 ms and at 1 ms) and `profile` (cProfile + tracemalloc,
+sources run serially). `off_serial` (--workers 1) is the fair baseline for `profile`. Reported per mode:
+median wall and process CPU time over --repeat rounds, and CPU overhead against its baseline.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fixture_server  # noqa: E402
+import main  # noqa: E402
+from bench_scrapers import point_sources_at, quietly  # noqa: E402
+
+MODES = {
+    "off": [],
+    "sample": ["--profile-sample"],
+    "sample_1ms": ["--profile-sample", "1"],
+    "off_serial": ["--workers", "1"],
+    "profile": ["--profile"],
+}
+BASELINES = {"sample": "off", "sample_1ms": "off", "profile": "off_serial"}
+
+
+def _run(config_path: Path, extra_argv: list[str]) -> tuple[float, float]:
+    argv = ["--sources-config", str(config_path), "--no-cache", "--full-crawl", "--no-pretty-json", *extra_argv]
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    exit_code = quietly(main.main, argv)
+    if exit_code != 0:
+        raise RuntimeError(f"main.main exited with {exit_code} for {extra_argv}")
+    return time.perf_counter() - wall_started, time.process_time() - cpu_started
+
+
+def bench_modes(config_path: Path, repeat: int) -> dict[str, dict]:
+    """Run the modes round-robin, after one warm-up run each, so drift affects them all alike."""
+    timings: dict[str, list[tuple[float, float]]] = {mode: [] for mode in MODES}
+    for mode, extra_argv in MODES.items():
+        _run(config_path, extra_argv)
+    for _ in range(repeat):
+        for mode, extra_argv in MODES.items():
+            timings[mode].append(_run(config_path, extra_argv))
+    return {
+        mode: {
+            "wall_ms": round(statistics.median(wall for wall, _ in runs) * 1000, 1),
+            "cpu_ms": round(statistics.median(cpu for _, cpu in runs) * 1000, 1),
+        }
+        for mode, runs in timings.items()
+    }
+
+
+def main_cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=80, help="posts per source in generated fixtures")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds over all modes; the median is reported")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    original_dir = os.getcwd()
+    with fixture_server.FixtureServer(fixture_server.build_fixtures(args.posts)) as server, tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            config_path = Path(work_dir) / "sources.json"
+            point_sources_at(server, config_path)
+            results = bench_modes(config_path, args.repeat)
+        finally:
+            os.chdir(original_dir)
+
+    for mode, baseline in BASELINES.items():
+        results[mode]["cpu_overhead_pct"] = round((results[mode]["cpu_ms"] / results[baseline]["cpu_ms"] - 1) * 100, 1)
+
+    if args.json:
+        print(json.dumps({"posts": args.posts, "repeat": args.repeat, "modes": results}, indent=2))
+    else:
+        for mode, row in results.items():
+            overhead = f", CPU overhead {row['cpu_overhead_pct']:+.1f}% vs {BASELINES[mode]}" if mode in BASELINES else ""
+            print(f"{mode}: wall {row['wall_ms']:.0f} ms, CPU {row['cpu_ms']:.0f} ms{overhead}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Compare single-record and date-slice reads from the record archive against loading combined_feed.json.
+
+Usage: python3 benchmarks/bench_record_archive.py [--records N] [--content-kb N] [--repeat N] [--json]
+
+Each measurement runs in a fresh interpreter so that its peak resident memory is its own; `interpreter`
+is the same child doing nothing, for reference.
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import feed_record  # noqa: E402
+import feed_writer  # noqa: E402
+import record_archive  # noqa: E402
+import timestamps  # noqa: E402
+
+FIELDS = ["title", "url", "date", "published_at", "content"]
+MODES = ("interpreter", "json_get", "archive_get", "json_slice", "archive_slice")
+
+
+def synthetic_records(count: int, content_kb: int, seed: int = 1) -> list[feed_record.Record]:
+    rnd = random.Random(seed)
+    newest = datetime(2025, 6, 30, tzinfo=timezone.utc)
+    words = [f"word{index}" for index in range(5000)]
+    records = []
+    for index in range(count):
+        published = newest - timedelta(minutes=index * 30)
+        content = " ".join(rnd.choice(words) for _ in range(content_kb * 1024 // 8))
+        records.append(
+            feed_record.Record(
+                "synthetic",
+                f"Post {index}",
+                f"https://example.com/post/{index}",
+                published.strftime("%B %d, %Y"),
+                timestamps.utc_iso(published),
+                content,
+            )
+        )
+    return records
+
+
+def peak_rss_kb() -> int:
+    # VmHWM starts over at exec; on Linux ru_maxrss can still include the parent's pages from before the fork.
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_child(mode: str, output_dir: Path, url: str, since: str) -> dict:
+    """Body of one measurement subprocess; returns elapsed time and peak RSS."""
+    started = time.perf_counter()
+    if mode == "json_get":
+        records = json.loads((output_dir / "combined_feed.json").read_text(encoding="utf-8"))
+        found = [record for record in records if record["url"] == url]
+    elif mode == "archive_get":
+        with record_archive.RecordArchive(output_dir / "combined_feed.records") as archive:
+            found = [archive.get(url)]
+    elif mode == "json_slice":
+        records = json.loads((output_dir / "combined_feed.json").read_text(encoding="utf-8"))
+        found = [record for record in records if record["published_at"] >= since]
+    elif mode == "archive_slice":
+        with record_archive.RecordArchive(output_dir / "combined_feed.records") as archive:
+            found = list(archive.between(since))
+    else:
+        found = []
+    elapsed = time.perf_counter() - started
+    return {"ms": elapsed * 1000, "records": len(found), "max_rss_kb": peak_rss_kb()}
+
+
+def measure(mode: str, output_dir: Path, url: str, since: str, repeat: int) -> dict:
+    best: dict | None = None
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", mode, str(output_dir), url, since],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        result = json.loads(completed.stdout)
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None and len(sys.argv) > 1 and sys.argv[1] == "--child":
+        mode, output_dir, url, since = sys.argv[2:6]
+        print(json.dumps(run_child(mode, Path(output_dir), url, since)))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--content-kb", type=int, default=4, help="approximate content size per record")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode; the fastest is reported")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    records = synthetic_records(args.records, args.content_kb)
+    url = records[len(records) // 2].url
+    # About one day of posts at one post every 30 minutes.
+    since = records[min(47, len(records) - 1)].published_at
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        output_dir = Path(work_dir)
+        writer = feed_writer.StreamingFeedWriter(output_dir, "combined_feed", FIELDS, archive=True)
+        writer.write_records(records)
+        writer.commit()
+        results = {
+            "records": args.records,
+            "json_mb": round(writer.json_path.stat().st_size / 1e6, 1),
+            "archive_mb": round(writer.archive_path.stat().st_size / 1e6, 1),
+            "index_kb": round(record_archive.index_path_for(writer.archive_path).stat().st_size / 1e3, 1),
+            "modes": {mode: measure(mode, output_dir, url, since, args.repeat) for mode in MODES},
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{results['records']} records: JSON {results['json_mb']} MB, archive {results['archive_mb']} MB "
+            f"+ {results['index_kb']} KB index"
+        )
+        for mode, row in results["modes"].items():
+            print(f"  {mode}: {row['ms']:.2f} ms, {row['records']} records, peak RSS {row['max_rss_kb'] / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Compare per-record memory and backfill peak RSS of plain dict records against feed_record.Record.
+
+Usage: python3 benchmarks/bench_records.py [--records N] [--content-kb N] [--json]
+
+`overhead` is the traced allocation per record for everything but the content text (the same content
+strings are shared by both layouts). `backfill` runs main's merge path in a fresh interpreter per mode:
+six sources' worth of records are built and held until all are in, then sorted newest-first, k-way merged
+and written as JSONL. `dict` is the old layout, `record` holds the content as text and `record_spooled`
+moves it to a ContentSpool as each source finishes, as main.py does.
+"""
+import argparse
+import heapq
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter, itemgetter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import feed_record  # noqa: E402
+import timestamps  # noqa: E402
+from bench_record_archive import peak_rss_kb  # noqa: E402
+
+SOURCES = ("andon_labs", "technologyreview", "openai_news", "deepmind_blog", "anthropic_news", "xai_news")
+MODES = ("dict", "record", "record_spooled")
+NEWEST = datetime(2025, 6, 30, tzinfo=timezone.utc)
+
+
+def _paragraphs(content_kb: int) -> list[str]:
+    return [" ".join(f"word{(seed * 7919 + index) % 5000}" for index in range(content_kb * 1024 // 8)) for seed in range(64)]
+
+
+def _fields(index: int) -> tuple[str, str, str, datetime]:
+    published = NEWEST - timedelta(minutes=index * 30)
+    return f"Post {index}", f"https://example.com/post/{index}", published.strftime("%B %d, %Y"), published
+
+
+def _build(mode: str, source: str, index: int, content: str):
+    title, url, date_text, published = _fields(index)
+    if mode == "dict":
+        return {"title": title, "url": url, "date": date_text, "published_at": timestamps.utc_iso(published), "content": content}
+    return feed_record.Record(source, title, url, date_text, timestamps.utc_iso(published), content)
+
+
+def overhead_bytes(mode: str, count: int) -> float:
+    content = "shared content"
+    tracemalloc.start()
+    records = [_build(mode, SOURCES[index % len(SOURCES)], index, content) for index in range(count)]
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return traced / count
+
+
+def run_backfill(mode: str, count: int, content_kb: int) -> dict:
+    """Body of one measurement subprocess; returns elapsed time and peak RSS."""
+    paragraphs = _paragraphs(content_kb)
+    started = time.perf_counter()
+    spool = feed_record.ContentSpool()
+    streams = []
+    for source_index, source in enumerate(SOURCES):
+        # A fresh string per record, as if each had been extracted from its own page.
+        records = [
+            _build(mode, source, index, f"{index} {paragraphs[index % len(paragraphs)]}")
+            for index in range(source_index, count, len(SOURCES))
+        ]
+        if mode == "record_spooled":
+            spool.spill(records)
+        key = itemgetter("published_at") if mode == "dict" else attrgetter("published_ts")
+        streams.append((sorted(records, key=key, reverse=True), key))
+
+    written = 0
+    with tempfile.TemporaryFile("w", encoding="utf-8") as output:
+        for record in heapq.merge(*(stream for stream, _ in streams), key=streams[0][1], reverse=True):
+            row = record if mode == "dict" else record.as_dict()
+            output.write(json.dumps(row, ensure_ascii=False) + "\n")
+            written += 1
+    spool.close()
+    return {"ms": round((time.perf_counter() - started) * 1000, 1), "records": written, "max_rss_kb": peak_rss_kb()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None and len(sys.argv) > 1 and sys.argv[1] == "--child":
+        mode, count, content_kb = sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+        print(json.dumps(run_backfill(mode, count, content_kb)))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000, help="records across all six sources")
+    parser.add_argument("--content-kb", type=int, default=4, help="approximate content size per record")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {
+        "records": args.records,
+        "content_kb": args.content_kb,
+        "overhead_bytes_per_record": {mode: round(overhead_bytes(mode, args.records)) for mode in ("dict", "record")},
+        "backfill": {},
+    }
+    for mode in MODES:
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", mode, str(args.records), str(args.content_kb)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results["backfill"][mode] = json.loads(completed.stdout)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        overhead = results["overhead_bytes_per_record"]
+        print(f"per-record overhead without content: dict {overhead['dict']} B, Record {overhead['record']} B")
+        print(f"backfill of {args.records} records with ~{args.content_kb} KB content each:")
+        for mode, row in results["backfill"].items():
+            print(f"  {mode}: {row['ms']:.0f} ms, peak RSS {row['max_rss_kb'] / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Offline benchmark of every source and of main.main against a local replay of the sources.
+
+Usage: python3 benchmarks/bench_scrapers.py [--posts N] [--latency-ms MS] [--repeat N] [--fixtures DIR]
+                                           [--save-fixtures DIR] [--json] [--output FILE]
+
+A copy of the source registry with its feed URLs, and each custom scraper module's FEED_URL/BASE_URL/...
+constants, are pointed at a fixture_server.FixtureServer, so no request leaves the machine. Reported:
+- per source: best wall and CPU time of run() with caches off and no injected latency, parse throughput
+  (fixture bytes and records per CPU second) and requests per run;
+- main.main wall time with injected latency, cold (--no-cache --full-crawl), a cold metadata-only headline
+  refresh (--fields title,url,date) and with warm on-disk caches;
+- tracemalloc peak of one cold main.main run;
+- request counts seen by the stand-in for every phase.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import crawl_state  # noqa: E402
+import extraction_cache  # noqa: E402
+import fixture_server  # noqa: E402
+import http_cache  # noqa: E402
+import http_client  # noqa: E402
+import main  # noqa: E402
+import source_registry  # noqa: E402
+
+
+def point_sources_at(server: fixture_server.FixtureServer, config_path: Path) -> list:
+    """Write a source registry whose feed URLs use the stand-in and repoint the custom scraper modules."""
+    config = json.loads(source_registry.CONFIG_PATH.read_text(encoding="utf-8"))
+    for entry in config["sources"]:
+        if "feed_url" in entry:
+            entry["feed_url"] = server.local_url(entry["feed_url"])
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+
+    sources = source_registry.load_sources(config_path)
+    for source in sources:
+        if isinstance(source, source_registry.ModuleSource):
+            for name, value in vars(source.module).items():
+                if name.endswith("_URL") and isinstance(value, str):
+                    setattr(source.module, name, server.local_url(value))
+    return sources
+
+
+def _set_caches(enabled: bool) -> None:
+    http_cache.CACHE_ENABLED = enabled
+    extraction_cache.ENABLED = enabled
+    crawl_state.ENABLED = enabled
+
+
+def quietly(function, *args):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return function(*args)
+
+
+def _downloaded_bytes() -> int:
+    return sum(http_client.bytes_downloaded().values())
+
+
+def bench_sources(server: fixture_server.FixtureServer, sources: list, repeat: int) -> list[dict]:
+    server.control(latency_ms=0)
+    _set_caches(False)
+    results = []
+    for source in sources:
+        best_wall = best_cpu = float("inf")
+        records = 0
+        requests_before = server.control()["requests"]
+        bytes_before = _downloaded_bytes()
+        for _ in range(repeat):
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            records = len(quietly(source.run))
+            best_wall = min(best_wall, time.perf_counter() - wall_started)
+            best_cpu = min(best_cpu, time.process_time() - cpu_started)
+        bytes_per_run = (_downloaded_bytes() - bytes_before) / repeat
+        cpu_seconds = max(best_cpu, 1e-9)
+        results.append(
+            {
+                "source": source.name,
+                "records": records,
+                "requests_per_run": (server.control()["requests"] - requests_before) / repeat,
+                "bytes_per_run": int(bytes_per_run),
+                "best_wall_ms": round(best_wall * 1000, 2),
+                "best_cpu_ms": round(best_cpu * 1000, 2),
+                "throughput_mb_per_cpu_s": round(bytes_per_run / cpu_seconds / 1e6, 2),
+                "records_per_cpu_s": round(records / cpu_seconds, 1),
+            }
+        )
+    http_client.close_all()
+    return results
+
+
+def _run_main(server: fixture_server.FixtureServer, phase: str, argv: list[str]) -> dict:
+    before = server.control()
+    started = time.perf_counter()
+    exit_code = quietly(main.main, argv)
+    wall_seconds = time.perf_counter() - started
+    after = server.control()
+    return {
+        "phase": phase,
+        "exit_code": exit_code,
+        "wall_ms": round(wall_seconds * 1000, 2),
+        "requests": after["requests"] - before["requests"],
+        "not_modified": after["not_modified"] - before["not_modified"],
+        "bytes_served": after["bytes_served"] - before["bytes_served"],
+    }
+
+
+def bench_main(server: fixture_server.FixtureServer, config_path: Path, latency_ms: float) -> tuple[list[dict], float]:
+    config_argv = ["--sources-config", str(config_path)]
+    cold_argv = [*config_argv, "--no-cache", "--full-crawl", "--no-pretty-json"]
+
+    server.control(latency_ms=0)
+    tracemalloc.start()
+    try:
+        quietly(main.main, cold_argv)
+        peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+    server.control(latency_ms=latency_ms)
+    runs = [_run_main(server, "cold", cold_argv)]
+    runs.append(_run_main(server, "headlines", [*cold_argv, "--fields", "title,url,date"]))
+    # The cached runs start from an empty cache.
+    shutil.rmtree(".cache", ignore_errors=True)
+    runs.append(_run_main(server, "cache_fill", [*config_argv, "--no-pretty-json"]))
+    runs.append(_run_main(server, "cache_warm", [*config_argv, "--no-pretty-json"]))
+    return runs, round(peak_kib, 1)
+
+
+def main_cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=40, help="posts per source in generated fixtures")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="latency injected into every main.main request")
+    parser.add_argument("--repeat", type=int, default=3, help="run() repetitions per source")
+    parser.add_argument("--fixtures", type=Path, help="replay a fixture directory instead of generating one")
+    parser.add_argument("--save-fixtures", type=Path, help="write the generated fixtures to this directory")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", type=Path, help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    if args.fixtures:
+        fixtures = fixture_server.load_fixtures(args.fixtures)
+    else:
+        fixtures = fixture_server.build_fixtures(args.posts)
+    if args.save_fixtures:
+        fixture_server.save_fixtures(fixtures, args.save_fixtures)
+    output_path = args.output.resolve() if args.output else None
+
+    with fixture_server.FixtureServer(fixtures) as server, tempfile.TemporaryDirectory() as work_dir:
+        # Output files and the .cache/ directories are relative to the working directory.
+        original_dir = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            config_path = Path(work_dir) / "sources.json"
+            sources = point_sources_at(server, config_path)
+            source_rows = bench_sources(server, sources, args.repeat)
+            main_runs, peak_kib = bench_main(server, config_path, args.latency_ms)
+        finally:
+            os.chdir(original_dir)
+
+    results = {
+        "python": platform.python_version(),
+        "fixtures": {"pages": len(fixtures), "bytes": sum(len(body) for body in fixtures.values())},
+        "latency_ms": args.latency_ms,
+        "sources": source_rows,
+        "main": main_runs,
+        "main_peak_kib": peak_kib,
+    }
+    if output_path:
+        output_path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in source_rows:
+            print(
+                f"{row['source']}: {row['records']} records, {row['requests_per_run']:.0f} requests, "
+                f"{row['bytes_per_run']} bytes, wall {row['best_wall_ms']:.1f} ms, cpu {row['best_cpu_ms']:.1f} ms, "
+                f"{row['throughput_mb_per_cpu_s']:.2f} MB/cpu-s"
+            )
+        for row in main_runs:
+            print(
+                f"main.main [{row['phase']}] exit {row['exit_code']}: {row['wall_ms']:.0f} ms, "
+                f"{row['requests']} requests ({row['not_modified']} not modified), {row['bytes_served']} bytes served"
+            )
+        print(f"main.main peak traced memory: {peak_kib:.0f} KiB")
+    return 0 if all(row["exit_code"] == 0 for row in main_runs) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
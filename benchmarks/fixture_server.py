@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Fixtures for every scraper and a local HTTP stand-in that replays them.
+
+A fixture set maps absolute URLs on the real sites to response bodies. `FixtureServer` starts one local
+listener per origin in a child process and rewrites the origins inside the bodies, so links found in a
+feed or listing lead back to the stand-in. Latency can be injected per request, and request counts are
+read back from the child over a control endpoint.
+"""
+import json
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import urlopen
+
+CONTROL_PREFIX = "/__bench"
+FEED_ORIGINS = {
+    "openai": "https://openai.com/news/rss.xml",
+    "deepmind": "https://deepmind.google/blog/rss.xml",
+    "technologyreview": "https://www.technologyreview.com/topic/artificial-intelligence/feed/",
+    "anthropic": "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_news.xml",
+}
+ANTHROPIC_SITE = "https://www.anthropic.com"
+XAI_SITE = "https://x.ai"
+ANDON_SITE = "https://andonlabs.com"
+
+WORDS = (
+    "the model agent safety research evaluation training data compute policy we are to of and in a is "
+    "that for it as with on &amp; it&#x27;s &quot;quoted&quot;"
+).split()
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _sentence(rnd: random.Random, low: int = 15, high: int = 60) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(low, high)))
+
+
+def _published(index: int) -> date:
+    # Two days apart, newest first: about half of every feed is inside the 30-day window.
+    return date.today() - timedelta(days=index * 2)
+
+
+def _rss_items(name: str, posts: int, rnd: random.Random, link_base: str, encoded: bool) -> list[str]:
+    items = []
+    for index in range(posts):
+        published = datetime.combine(_published(index), datetime.min.time(), tzinfo=timezone.utc)
+        body = "".join(f"<p>{_sentence(rnd)}</p>" for _ in range(4))
+        content = f"<content:encoded><![CDATA[{body * 6}]]></content:encoded>" if encoded else ""
+        items.append(
+            f"<item><title>{name} post {index} &amp; notes</title><link>{link_base}/post-{index}</link>"
+            f"<pubDate>{format_datetime(published)}</pubDate><description><![CDATA[{body}]]></description>"
+            f"{content}</item>"
+        )
+    return items
+
+
+def _rss(name: str, items: list[str], next_url: str | None = None) -> str:
+    atom_namespace = ' xmlns:atom="http://www.w3.org/2005/Atom"' if next_url else ""
+    next_link = f'<atom:link href="{next_url}" rel="next"/>' if next_url else ""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" '
+        f'xmlns:content="http://purl.org/rss/1.0/modules/content/"{atom_namespace}>'
+        f"<channel><title>{name}</title>{next_link}{''.join(items)}</channel></rss>"
+    )
+
+
+def _paged(url: str, query_name: str, entries: list[str], page_size: int | None) -> list[tuple[str, list[str], str | None]]:
+    """Split entries into (page_url, entries, next_page_url) pages; the first page keeps the plain URL."""
+    if page_size is None:
+        return [(url, entries, None)]
+    chunks = [entries[start : start + page_size] for start in range(0, len(entries), page_size)] or [[]]
+    urls = [url] + [f"{url}?{query_name}={number}" for number in range(2, len(chunks) + 1)]
+    return [(urls[index], chunk, urls[index + 1] if index + 1 < len(urls) else None) for index, chunk in enumerate(chunks)]
+
+
+def _article_page(rnd: random.Random, title: str, paragraphs: int, trailer: str = "") -> str:
+    scripts = "".join(f'<script>self.__next_f.push([1,"{"x" * rnd.randint(500, 4000)}"])</script>' for _ in range(12))
+    body = "".join(f'<div class="block"><p>{_sentence(rnd)} <a href="/x">link</a> <em>it</em>.</p></div>' for _ in range(paragraphs))
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title>{scripts}<style>.a{{color:red}}</style></head>"
+        f'<body><nav><a href="/">Home</a></nav><main><article><h1>{title}</h1>{body}</article>{trailer}</main>'
+        "<footer><p>Privacy policy</p></footer></body></html>"
+    )
+
+
+def build_fixtures(posts: int = 40, seed: int = 1, page_size: int | None = None) -> dict[str, bytes]:
+    """Generate a deterministic fixture set shaped like the six sources, dated relative to today.
+
+    With `page_size`, feeds and listings hold that many entries per page and link to the next, older
+    page (an atom:link rel="next" in feeds, an <a rel="next"> on listings), as archive pages do.
+    """
+    rnd = random.Random(seed)
+    pages: dict[str, str] = {}
+    for name, feed_url in FEED_ORIGINS.items():
+        link_base = f"{ANTHROPIC_SITE}/news" if name == "anthropic" else f"{_origin(feed_url)}/{name}"
+        items = _rss_items(name, posts, rnd, link_base, encoded=name == "technologyreview")
+        for page_url, page_items, next_url in _paged(feed_url, "paged", items, page_size):
+            pages[page_url] = _rss(name, page_items, next_url)
+    for index in range(posts):
+        pages[f"{ANTHROPIC_SITE}/news/post-{index}"] = _article_page(rnd, f"Anthropic {index}", 40)
+
+    cards = []
+    for index in range(posts):
+        day = _published(index).strftime("%B %d, %Y")
+        cards.append(
+            f'<div class="card"><a href="/news/post-{index}"><h3>xAI post {index}</h3></a><p>{day}</p>'
+            f'<a href="/news/post-{index}">Read</a></div>'
+        )
+        pages[f"{XAI_SITE}/news/post-{index}"] = _article_page(rnd, f"xAI {index}", 30, "<p>Try Grok On</p>")
+    for page_url, page_cards, next_url in _paged(f"{XAI_SITE}/news", "page", cards, page_size):
+        older = f'<a rel="next" href="{next_url}">Older posts</a>' if next_url else ""
+        pages[page_url] = f'<html><body><a href="/news">News</a><main>{"".join(page_cards)}</main>{older}</body></html>'
+
+    cards = []
+    for index in range(posts):
+        day = _published(index)
+        cards.append(
+            f'<article class="post"><a href="/blog/post-{index}" class="t"><h2>Andon post {index}</h2></a>'
+            f"<p>{_sentence(rnd)}</p><time>{day.month}/{day.day}/{day.year}</time></article>"
+        )
+        prose = "".join(f"<p>{_sentence(rnd)}</p>" for _ in range(30))
+        pages[f"{ANDON_SITE}/blog/post-{index}"] = (
+            f'<html><body><nav>Blog</nav><div class="prose lg">{prose}<script>track()</script></div>'
+            "<footer>Andon Labs</footer></body></html>"
+        )
+    for page_url, page_cards, next_url in _paged(f"{ANDON_SITE}/blog", "page", cards, page_size):
+        older = f'<a rel="next" href="{next_url}">Older posts</a>' if next_url else ""
+        pages[page_url] = f"<html><body><main>{''.join(page_cards)}</main>{older}</body></html>"
+    return {url: body.encode("utf-8") for url, body in pages.items()}
+
+
+def save_fixtures(fixtures: dict[str, bytes], directory: Path) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for url, body in sorted(fixtures.items()):
+        file_name = f"{sha256(url.encode('utf-8')).hexdigest()[:16]}.body"
+        (directory / file_name).write_bytes(body)
+        manifest[url] = file_name
+    (directory / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+
+def load_fixtures(directory: Path) -> dict[str, bytes]:
+    """Load a set written by `save_fixtures` (or recorded by hand in the same layout)."""
+    manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    return {url: (directory / file_name).read_bytes() for url, file_name in manifest.items()}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        state = self.server.state
+        if self.path.startswith(CONTROL_PREFIX):
+            self._control(state)
+            return
+
+        time.sleep(state["latency_seconds"])
+        body = self.server.pages.get(self.path)
+        with state["lock"]:
+            state["requests"] += 1
+        if body is None:
+            self._reply(404, b"")
+            return
+
+        etag = f'"{sha256(body).hexdigest()[:32]}"'
+        if self.headers.get("If-None-Match") == etag:
+            with state["lock"]:
+                state["not_modified"] += 1
+            self._reply(304, b"", {"ETag": etag})
+            return
+        with state["lock"]:
+            state["bytes_served"] += len(body)
+        self._reply(200, body, {"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+    def _control(self, state: dict) -> None:
+        query = parse_qs(urlsplit(self.path).query)
+        if "latency_ms" in query:
+            state["latency_seconds"] = float(query["latency_ms"][0]) / 1000
+        with state["lock"]:
+            stats = {key: state[key] for key in ("requests", "not_modified", "bytes_served")}
+        self._reply(200, json.dumps(stats).encode("utf-8"))
+
+    def _reply(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address) -> None:
+        # Clients that stop reading a page early hang up mid-response; that is expected here.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _serve(pages_by_origin: dict[str, dict[str, bytes]], ready: multiprocessing.Queue, stop: multiprocessing.Event) -> None:
+    state = {"lock": threading.Lock(), "latency_seconds": 0.0, "requests": 0, "not_modified": 0, "bytes_served": 0}
+    servers = {origin: _QuietServer(("127.0.0.1", 0), _FixtureHandler) for origin in pages_by_origin}
+    local_origins = {origin: f"http://127.0.0.1:{server.server_address[1]}" for origin, server in servers.items()}
+
+    for origin, server in servers.items():
+        pages = {}
+        for path, body in pages_by_origin[origin].items():
+            # Absolute links in feeds and listings have to lead back to the stand-in.
+            for real_origin, local_origin in local_origins.items():
+                body = body.replace(real_origin.encode("utf-8"), local_origin.encode("utf-8"))
+            pages[path] = body
+        server.daemon_threads = True
+        server.pages = pages
+        server.state = state
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    ready.put(local_origins)
+    stop.wait()
+    for server in servers.values():
+        server.shutdown()
+
+
+class FixtureServer:
+    """Serve a fixture set from a child process, one 127.0.0.1 port per original origin."""
+
+    def __init__(self, fixtures: dict[str, bytes]) -> None:
+        self._fixtures = fixtures
+        self._stop = multiprocessing.Event()
+        self._process: multiprocessing.Process | None = None
+        self.local_origins: dict[str, str] = {}
+
+    def __enter__(self) -> "FixtureServer":
+        pages_by_origin: dict[str, dict[str, bytes]] = {}
+        for url, body in self._fixtures.items():
+            parts = urlsplit(url)
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            pages_by_origin.setdefault(_origin(url), {})[path] = body
+
+        ready: multiprocessing.Queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve, args=(pages_by_origin, ready, self._stop), daemon=True)
+        self._process.start()
+        self.local_origins = ready.get(timeout=60)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._process is not None:
+            self._process.join(timeout=10)
+
+    def local_url(self, url: str) -> str:
+        origin = _origin(url)
+        if origin not in self.local_origins:
+            return url
+        return self.local_origins[origin] + url[len(origin) :]
+
+    def control(self, **params: float) -> dict[str, int]:
+        """Apply settings such as `latency_ms` and return the request counters served so far."""
+        query = "&".join(f"{name}={value}" for name, value in params.items())
+        control_url = f"{next(iter(self.local_origins.values()))}{CONTROL_PREFIX}?{query}"
+        with urlopen(control_url, timeout=10) as response:
+            return json.loads(response.read())
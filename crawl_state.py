@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+from pathlib import Path
+
+STATE_DIR = Path(".cache") / "crawl_state"
+ENABLED = True
+
+
+def fingerprint(*parts: str) -> str:
+    """Hash the listing-level fields of a post; a different value means the source changed it."""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class CrawlState:
+    """Extracted article content from earlier runs of one source, keyed by URL."""
+
+    def __init__(self, source: str) -> None:
+        self.path = STATE_DIR / f"{source}.json"
+        self._entries: dict[str, dict[str, str]] = {}
+        self._seen_urls: set[str] = set()
+        try:
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def lookup(self, url: str, post_fingerprint: str) -> str | None:
+        """Return stored content for `url` if it was extracted from an unchanged post, else None."""
+        self._seen_urls.add(url)
+        entry = self._entries.get(url)
+        if not ENABLED or entry is None or entry.get("fingerprint") != post_fingerprint:
+            return None
+        return entry.get("content")
+
+    def remember(self, url: str, post_fingerprint: str, content: str) -> None:
+        self._seen_urls.add(url)
+        self._entries[url] = {"fingerprint": post_fingerprint, "content": content}
+
+    def save(self) -> None:
+        # Only posts seen in this run are kept, so entries drop out with the date window.
+        entries = {url: entry for url, entry in self._entries.items() if url in self._seen_urls}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
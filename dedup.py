@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import feed_record
+
+TRACKING_PARAM_PREFIXES = ("utm_", "_hs", "mc_", "pk_")
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "dclid", "msclkid", "yclid", "twclid", "igshid", "mkt_tok", "ref", "ref_src", "cmpid"})
+
+WORD_PATTERN = re.compile(r"\w+")
+SHINGLE_WORDS = 5
+# Texts shorter than this many shingles are only matched by URL; short descriptions share too much phrasing.
+MIN_SHINGLES = 20
+SIGNATURE_BINS = 128
+# 32 bands of 4 bins: pairs above ~0.5 estimated similarity almost always share a band, pairs far below rarely do.
+LSH_BANDS = 32
+SIMILARITY_THRESHOLD = 0.8
+EMPTY_BIN = -1
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so that http/https, www., default ports, fragments and tracking parameters compare equal."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[len("www.") :]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def content_signature(text: str) -> tuple[int, ...] | None:
+    """One-permutation MinHash of the text's word shingles, or None when the text is too short to compare.
+
+    Each shingle is hashed once and lands in one of SIGNATURE_BINS bins by its low bits; a bin keeps the
+    smallest remaining hash. The share of matching bins estimates Jaccard similarity like a MinHash
+    with SIGNATURE_BINS permutations, at the cost of a single hash per shingle.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    shingle_count = len(words) - SHINGLE_WORDS + 1
+    if shingle_count < MIN_SHINGLES:
+        return None
+
+    bins = [EMPTY_BIN] * SIGNATURE_BINS
+    for index in range(shingle_count):
+        shingle = " ".join(words[index : index + SHINGLE_WORDS]).encode("utf-8")
+        shingle_hash = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        bin_index = shingle_hash % SIGNATURE_BINS
+        value = shingle_hash // SIGNATURE_BINS
+        if bins[bin_index] == EMPTY_BIN or value < bins[bin_index]:
+            bins[bin_index] = value
+    return tuple(bins)
+
+
+def estimated_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    compared = matching = 0
+    for left_value, right_value in zip(left, right):
+        if left_value == EMPTY_BIN and right_value == EMPTY_BIN:
+            continue
+        compared += 1
+        matching += left_value == right_value
+    return matching / compared if compared else 0.0
+
+
+class Deduplicator:
+    """Drop records whose canonical URL or content was already seen; the first record of a group is kept.
+
+    Content candidates come from an LSH index over signature bands, so each record is compared with the
+    few records it shares a band with instead of every record kept so far.
+    """
+
+    def __init__(self) -> None:
+        self.merges: list[dict[str, object]] = []
+        self._kept_by_url: dict[str, feed_record.Record] = {}
+        self._kept: list[tuple[feed_record.Record, tuple[int, ...]]] = []
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+        self._rows_per_band = SIGNATURE_BINS // LSH_BANDS
+
+    def _bands(self, signature: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+        rows = self._rows_per_band
+        return [(band, signature[band * rows : (band + 1) * rows]) for band in range(LSH_BANDS)]
+
+    def _record_merge(self, kept: feed_record.Record, dropped: feed_record.Record, reason: str, similarity: float) -> None:
+        self.merges.append(
+            {
+                "kept_url": kept.url,
+                "kept_title": kept.title,
+                "dropped_url": dropped.url,
+                "dropped_title": dropped.title,
+                "reason": reason,
+                "similarity": round(similarity, 3),
+            }
+        )
+
+    def add(self, record: feed_record.Record) -> bool:
+        """Return True if the record is new and should be written, False if it duplicates a kept one."""
+        url_key = canonical_url(record.url)
+        kept = self._kept_by_url.get(url_key)
+        if kept is not None:
+            self._record_merge(kept, record, "url", 1.0)
+            return False
+
+        signature = content_signature(record.content)
+        if signature is not None:
+            bands = self._bands(signature)
+            candidates = {index for band in bands for index in self._buckets.get(band, ())}
+            best_index, best_similarity = -1, 0.0
+            for index in sorted(candidates):
+                similarity = estimated_similarity(signature, self._kept[index][1])
+                if similarity > best_similarity:
+                    best_index, best_similarity = index, similarity
+            if best_similarity >= SIMILARITY_THRESHOLD:
+                self._record_merge(self._kept[best_index][0], record, "content", best_similarity)
+                return False
+
+            for band in bands:
+                self._buckets.setdefault(band, []).append(len(self._kept))
+            self._kept.append((record, signature))
+
+        self._kept_by_url[url_key] = record
+        return True
+
+    def filter(self, records: list[feed_record.Record]) -> list[feed_record.Record]:
+        return [record for record in records if self.add(record)]
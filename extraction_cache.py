@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import extraction_pool
+import metrics
+
+CACHE_DIR = Path(".cache") / "extracted"
+MAX_CACHE_BYTES = 50 * 1024 * 1024
+ENABLED = True
+
+_eviction_lock = threading.Lock()
+
+
+def _entry_path(extractor_name: str, extractor_version: int, page_html: str) -> Path:
+    # The version is part of the file name, so entries from an older extractor are never read again and
+    # age out through LRU eviction.
+    digest = hashlib.sha256(page_html.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{extractor_name}-v{extractor_version}-{digest}.txt"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _evict_if_needed() -> None:
+    with _eviction_lock:
+        entries = []
+        total_bytes = 0
+        for entry_path in CACHE_DIR.glob("*.txt"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total_bytes <= MAX_CACHE_BYTES:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
+
+
+def _read_entry(entry_path: Path) -> str | None:
+    try:
+        content = entry_path.read_bytes().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    try:
+        os.utime(entry_path)
+    except FileNotFoundError:
+        pass
+    return content
+
+
+def _store_entry(entry_path: Path, content: str) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _write_atomic(entry_path, content.encode("utf-8"))
+
+
+def extract_many(
+    extractor_name: str,
+    extractor_version: int,
+    pages: list[str | None],
+    extractor: Callable[[str], str],
+) -> list[str | None]:
+    """Return `[extractor(page) for page in pages]`, reusing stored results for pages extracted before.
+
+    None (a page that failed to download) stays None. Pages that are not cached are extracted together
+    through extraction_pool, so a large batch is spread over worker processes instead of holding the GIL in this one.
+    """
+    contents: list[str | None] = [None] * len(pages)
+    misses: list[int] = []
+    for position, page_html in enumerate(pages):
+        if page_html is None:
+            continue
+        if ENABLED:
+            contents[position] = _read_entry(_entry_path(extractor_name, extractor_version, page_html))
+        if contents[position] is None:
+            misses.append(position)
+
+    if not misses:
+        return contents
+    with metrics.stage(extractor_name, "extract"):
+        extracted = extraction_pool.map_pages(extractor, [pages[position] for position in misses])
+    for position, content in zip(misses, extracted):
+        contents[position] = content
+        if ENABLED:
+            _store_entry(_entry_path(extractor_name, extractor_version, pages[position]), content)
+    if ENABLED:
+        _evict_if_needed()
+    return contents
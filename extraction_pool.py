@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import multiprocessing
+import os
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Set by main.py --extract-workers; 0 keeps extraction in the calling thread.
+WORKERS = os.cpu_count() or 1
+# Fewer new pages than this are extracted in the calling thread: starting the workers costs a few hundred
+# milliseconds, about what extracting this many pages in process takes.
+MIN_POOL_PAGES = 128
+# Pages are sent to the workers in batches of up to this much HTML, so small pages share one round trip.
+BATCH_BYTES = 512 * 1024
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+
+
+def _gil_enabled() -> bool:
+    # sys._is_gil_enabled() exists from Python 3.13; older interpreters always have the GIL.
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def _get_executor() -> Executor:
+    """The shared pool: threads on a free-threaded build, otherwise processes started without fork()."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if not _gil_enabled():
+                _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="extract")
+            else:
+                # Sources run in threads, and forking a threaded process can copy a held lock into the child.
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context(method))
+        return _executor
+
+
+def _extract_batch(extractor: Callable[[str], str], pages: list[str]) -> list[str]:
+    return [extractor(page) for page in pages]
+
+
+def _batches(pages: list[str]) -> list[list[str]]:
+    # Smaller batches than BATCH_BYTES when needed to give every worker about two of them.
+    limit = min(BATCH_BYTES, sum(map(len, pages)) // (WORKERS * 2) + 1)
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    batch_bytes = 0
+    for page in pages:
+        if batch and batch_bytes + len(page) > limit:
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(page)
+        batch_bytes += len(page)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def map_pages(extractor: Callable[[str], str], pages: list[str]) -> list[str]:
+    """Return `[extractor(page) for page in pages]`, in order, using the worker pool for large lists.
+
+    `extractor` has to be a module-level function so it can be sent to a worker process. If the pool
+    breaks (a worker was killed), the pages are extracted in the calling thread instead.
+    """
+    if WORKERS < 2 or len(pages) < MIN_POOL_PAGES:
+        return _extract_batch(extractor, pages)
+
+    batches = _batches(pages)
+    try:
+        results = list(_get_executor().map(_extract_batch, [extractor] * len(batches), batches))
+    except BrokenProcessPool as exc:
+        print(f"[extract] Worker pool failed ({exc}); extracting in process", file=sys.stderr)
+        shutdown()
+        return _extract_batch(extractor, pages)
+    return [content for batch in results for content in batch]
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
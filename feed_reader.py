@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import io
+from collections.abc import Callable, Generator, Iterator
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple
+from xml.etree import ElementTree as ET
+
+import backfill
+import timestamps
+
+CONTENT_ENCODED_TAG = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+
+class FeedItem(NamedTuple):
+    title: str
+    url: str
+    pub_date: str
+    # The pubDate as an ISO-8601 UTC timestamp (timestamps.utc_iso).
+    published_at: str
+    description: str
+    encoded_content: str
+
+
+def _published(pub_date_text: str) -> datetime | None:
+    if not pub_date_text:
+        return None
+    try:
+        return parsedate_to_datetime(pub_date_text)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_window_items(
+    xml_text: str,
+    feed_name: str,
+    window_days: int,
+    stop_after_out_of_window: int | None = None,
+) -> Generator[FeedItem, None, bool]:
+    """Yield RSS items with a title, link and a pubDate inside the window, parsing one item at a time.
+
+    Finished items are removed from the tree as soon as they have been read, so memory stays flat on
+    large feeds. For newest-first feeds, `stop_after_out_of_window` ends the scan once that many
+    consecutive items are older than the window. The window is backfill.window_bounds(window_days).
+    Returns whether any item was older than the window.
+    """
+    start_day, end_day = backfill.window_bounds(window_days)
+    parents: list[ET.Element] = []
+    saw_channel = False
+    saw_old = False
+    consecutive_old = 0
+
+    for event, element in ET.iterparse(io.StringIO(xml_text), events=("start", "end")):
+        if event == "start":
+            if element.tag == "channel" and len(parents) == 1:
+                saw_channel = True
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if element.tag != "item" or not parents or parents[-1].tag != "channel":
+            continue
+
+        title = element.findtext("title", default="").strip()
+        url = element.findtext("link", default="").strip()
+        pub_date = element.findtext("pubDate", default="").strip()
+        published = _published(pub_date)
+        # The window compares calendar days in the feed's own timezone.
+        published_day = published.date() if published is not None else None
+
+        if published_day is not None and published_day < start_day:
+            saw_old = True
+            consecutive_old += 1
+        elif published_day is not None and published_day <= end_day:
+            consecutive_old = 0
+
+        if title and url and published_day is not None and start_day <= published_day <= end_day:
+            yield FeedItem(
+                title=title,
+                url=url,
+                pub_date=pub_date,
+                published_at=timestamps.utc_iso(published),
+                description=element.findtext("description", default=""),
+                encoded_content=element.findtext(CONTENT_ENCODED_TAG, default=""),
+            )
+
+        parents[-1].remove(element)
+        if stop_after_out_of_window is not None and consecutive_old >= stop_after_out_of_window:
+            return True
+
+    if not saw_channel:
+        raise RuntimeError(f"Could not find RSS channel in {feed_name}.")
+    return saw_old
+
+
+def iter_paged_window_items(
+    xml_text: str,
+    feed_url: str,
+    fetch: Callable[[str], str],
+    feed_name: str,
+    window_days: int,
+    stop_after_out_of_window: int | None = None,
+) -> Iterator[FeedItem]:
+    """iter_window_items over a feed and, during a backfill, its older pages until one reaches past the range."""
+    if (yield from iter_window_items(xml_text, feed_name, window_days, stop_after_out_of_window)):
+        return
+    for page_text in backfill.older_pages(feed_url, xml_text, fetch, feed_name):
+        if (yield from iter_window_items(page_text, feed_name, window_days, stop_after_out_of_window)):
+            return
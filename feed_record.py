@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import sys
+import tempfile
+import threading
+from collections.abc import Iterable
+
+import timestamps
+
+
+class ContentRef:
+    """Content that lives in a ContentSpool; read back on every access."""
+
+    __slots__ = ("_spool", "offset", "length")
+
+    def __init__(self, spool: "ContentSpool", offset: int, length: int) -> None:
+        self._spool = spool
+        self.offset = offset
+        self.length = length
+
+    def read(self) -> str:
+        return self._spool.read(self.offset, self.length).decode("utf-8")
+
+
+class Record:
+    """One feed entry, as every source's run() returns it.
+
+    Slotted, with the source name interned and `published_at` kept as integer UTC seconds
+    (`published_ts`). `content` is either text or a ContentRef whose bytes are read when it is accessed.
+    """
+
+    __slots__ = ("source", "title", "url", "date", "published_ts", "_content")
+
+    def __init__(self, source: str, title: str, url: str, date: str, published_at: str, content: "str | ContentRef" = "") -> None:
+        self.source = sys.intern(source)
+        self.title = title
+        self.url = url
+        self.date = date
+        self.published_ts = timestamps.utc_seconds(published_at)
+        self._content = content
+
+    @property
+    def published_at(self) -> str:
+        return timestamps.utc_iso_from_seconds(self.published_ts)
+
+    @property
+    def content(self) -> str:
+        content = self._content
+        return content if isinstance(content, str) else content.read()
+
+    @content.setter
+    def content(self, value: "str | ContentRef") -> None:
+        self._content = value
+
+    def as_dict(self) -> dict[str, str]:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "date": self.date,
+            "published_at": self.published_at,
+            "content": self.content,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Record):
+            return NotImplemented
+        return (self.source, self.url, self.title, self.date, self.published_ts) == (
+            other.source,
+            other.url,
+            other.title,
+            other.date,
+            other.published_ts,
+        ) and self.content == other.content
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Record(source={self.source!r}, url={self.url!r}, published_at={self.published_at!r})"
+
+
+class ContentSpool:
+    """An anonymous temporary file that holds record content off the heap until the records are written.
+
+    Records keep working after `spill()`; their content is read back from the file on access, so the
+    spool has to stay open until they have been written out.
+    """
+
+    def __init__(self) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._lock = threading.Lock()
+        self._size = 0
+
+    def __enter__(self) -> "ContentSpool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def spill(self, records: Iterable[Record]) -> None:
+        """Move the content of every record that still holds text into the spool."""
+        with self._lock:
+            self._file.seek(self._size)
+            for record in records:
+                content = record._content
+                if not isinstance(content, str) or not content:
+                    continue
+                data = content.encode("utf-8")
+                self._file.write(data)
+                record._content = ContentRef(self, self._size, len(data))
+                self._size += len(data)
+
+    def read(self, offset: int, length: int) -> bytes:
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def close(self) -> None:
+        self._file.close()
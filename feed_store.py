@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+import argparse
+import re
+import sqlite3
+import sys
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+
+import feed_record
+import timestamps
+
+DEFAULT_DB_PATH = Path("output") / "feed.sqlite3"
+RECORD_COLUMNS = ("url", "source", "title", "date", "published_at", "content")
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    content TEXT NOT NULL,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_published_at ON records (published_at);
+CREATE INDEX IF NOT EXISTS records_source_published_at ON records (source, published_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5 (
+    title, content, content='records', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS records_fts_insert AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_delete AFTER DELETE ON records BEGIN
+    INSERT INTO records_fts (records_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_update AFTER UPDATE OF title, content ON records
+WHEN old.title IS NOT new.title OR old.content IS NOT new.content BEGIN
+    INSERT INTO records_fts (records_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO records_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO records (url, source, title, date, published_at, content, first_seen_at, last_seen_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET
+    source = excluded.source,
+    title = excluded.title,
+    date = excluded.date,
+    published_at = excluded.published_at,
+    content = excluded.content,
+    last_seen_at = excluded.last_seen_at
+"""
+# For records from a metadata-only run: new rows get what content there is, existing rows keep theirs.
+METADATA_UPSERT_SQL = """
+INSERT INTO records (url, source, title, date, published_at, content, first_seen_at, last_seen_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET
+    source = excluded.source,
+    title = excluded.title,
+    date = excluded.date,
+    published_at = excluded.published_at,
+    last_seen_at = excluded.last_seen_at
+"""
+
+
+def connect(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode = WAL")
+    try:
+        connection.executescript(SCHEMA)
+    except sqlite3.OperationalError as exc:
+        connection.close()
+        if "fts5" in str(exc):
+            raise RuntimeError(f"The SQLite store needs FTS5, which this SQLite build ({sqlite3.sqlite_version}) lacks.") from exc
+        raise
+    return connection
+
+
+def upsert_records(connection: sqlite3.Connection, records: Iterable[feed_record.Record], with_content: bool = True) -> int:
+    """Insert or update records keyed by URL in a single transaction; returns the row count.
+
+    With `with_content=False` the stored content of existing rows is left as it is.
+    """
+    seen_at = timestamps.utc_iso(datetime.now(timezone.utc))
+    rows = [
+        (record.url, record.source, record.title, record.date, record.published_at, record.content, seen_at, seen_at)
+        for record in records
+    ]
+    with connection:
+        connection.executemany(UPSERT_SQL if with_content else METADATA_UPSERT_SQL, rows)
+    return len(rows)
+
+
+def _match_expression(keywords: str) -> str:
+    # Every word must match; quoting keeps FTS5 operators and punctuation in user input literal.
+    return " ".join(f'"{term}"' for term in SEARCH_TERM_PATTERN.findall(keywords))
+
+
+def search(
+    connection: sqlite3.Connection,
+    keywords: str = "",
+    since: str | None = None,
+    until: str | None = None,
+    source: str | None = None,
+    limit: int = 50,
+) -> list[dict[str, str]]:
+    """Return stored records newest-first, filtered by FTS5 keywords, a published_at range and source.
+
+    `since`/`until` are compared with published_at as text, so a day ("2025-01-31") or a full timestamp works;
+    `until` is exclusive.
+    """
+    conditions: list[str] = []
+    parameters: list[object] = []
+    match_expression = _match_expression(keywords)
+    if match_expression:
+        # A rowid set rather than a join lets SQLite keep walking the (source, published_at) indexes.
+        conditions.append("rowid IN (SELECT rowid FROM records_fts WHERE records_fts MATCH ?)")
+        parameters.append(match_expression)
+    if since:
+        conditions.append("published_at >= ?")
+        parameters.append(since)
+    if until:
+        conditions.append("published_at < ?")
+        parameters.append(until)
+    if source:
+        conditions.append("source = ?")
+        parameters.append(source)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"SELECT {', '.join(RECORD_COLUMNS)} FROM records {where} ORDER BY published_at DESC LIMIT ?"
+    parameters.append(limit)
+    return [dict(row) for row in connection.execute(query, parameters)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the SQLite feed store written by main.py --sqlite.")
+    parser.add_argument("keywords", nargs="*", help="words that must all appear in the title or content")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help=f"database path (default: {DEFAULT_DB_PATH})")
+    parser.add_argument("--since", help="earliest published_at, e.g. 2025-01-01")
+    parser.add_argument("--until", help="published_at upper bound (exclusive)")
+    parser.add_argument("--source", help="only records from this source, e.g. openai_news")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"No feed store at {args.db}", file=sys.stderr)
+        return 1
+    connection = connect(args.db)
+    try:
+        records = search(connection, " ".join(args.keywords), args.since, args.until, args.source, args.limit)
+    finally:
+        connection.close()
+    for record in records:
+        print(f"{record['published_at']}  [{record['source']}] {record['title']}\n    {record['url']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
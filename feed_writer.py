@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import csv
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+import feed_record
+import record_archive
+
+
+class StreamingFeedWriter:
+    """Write records to JSONL and CSV as they arrive, then swap the finished files into place.
+
+    While a run is in progress the data lives in `<basename>.jsonl.partial` / `<basename>.csv.partial`,
+    which downstream tailers can follow; `commit()` renames them over the previous output atomically.
+    Only `fields` are written, in that order. With `archive=True` the records also go to `<basename>.records`
+    and its index (see record_archive.py).
+    """
+
+    def __init__(self, output_dir: Path, basename: str, fields: list[str], archive: bool = False) -> None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.jsonl_path = output_dir / f"{basename}.jsonl"
+        self.csv_path = output_dir / f"{basename}.csv"
+        self.json_path = output_dir / f"{basename}.json"
+        self.archive_path = output_dir / f"{basename}.records"
+        self.fields = fields
+        self.count = 0
+
+        self._partial_jsonl_path = self.jsonl_path.with_name(f"{self.jsonl_path.name}.partial")
+        self._partial_csv_path = self.csv_path.with_name(f"{self.csv_path.name}.partial")
+        self._jsonl_file = self._partial_jsonl_path.open("w", encoding="utf-8")
+        self._csv_file = self._partial_csv_path.open("w", newline="", encoding="utf-8")
+        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=fields)
+        self._csv_writer.writeheader()
+        self._archive = record_archive.RecordArchiveWriter(self.archive_path) if archive else None
+
+    def write_records(self, records: Iterable[feed_record.Record]) -> None:
+        for record in records:
+            row = record.as_dict()
+            if len(row) != len(self.fields):
+                row = {field: row[field] for field in self.fields}
+            self._jsonl_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._csv_writer.writerow(row)
+            if self._archive is not None:
+                self._archive.append(row)
+            self.count += 1
+        self._jsonl_file.flush()
+        self._csv_file.flush()
+
+    def commit(self, pretty_json: bool = True) -> None:
+        self._jsonl_file.close()
+        self._csv_file.close()
+        os.replace(self._partial_jsonl_path, self.jsonl_path)
+        os.replace(self._partial_csv_path, self.csv_path)
+        if self._archive is not None:
+            self._archive.commit()
+        if pretty_json:
+            write_pretty_json(self.jsonl_path, self.json_path)
+
+    def abort(self) -> None:
+        self._jsonl_file.close()
+        self._csv_file.close()
+        self._partial_jsonl_path.unlink(missing_ok=True)
+        self._partial_csv_path.unlink(missing_ok=True)
+        if self._archive is not None:
+            self._archive.abort()
+
+
+def write_pretty_json(jsonl_path: Path, json_path: Path) -> None:
+    """Convert a JSONL file into the indented JSON array format, one record in memory at a time.
+
+    The result is byte-for-byte what `json.dumps(records, indent=2, ensure_ascii=False)` produces.
+    """
+    partial_path = json_path.with_name(f"{json_path.name}.partial")
+    with jsonl_path.open(encoding="utf-8") as source, partial_path.open("w", encoding="utf-8") as target:
+        wrote_any = False
+        for line in source:
+            if not line.strip():
+                continue
+            record_json = json.dumps(json.loads(line), indent=2, ensure_ascii=False)
+            target.write(",\n" if wrote_any else "[\n")
+            target.write("\n".join(f"  {record_line}" for record_line in record_json.split("\n")))
+            wrote_any = True
+        target.write("\n]\n" if wrote_any else "[]\n")
+    os.replace(partial_path, json_path)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+import http.client
+import itertools
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+import fetch_stage
+import http_client
+import metrics
+
+DEFAULT_RUN_BUDGET_SECONDS = 300
+# A request is not started with less than this left of the run budget.
+MIN_REQUEST_SECONDS = 1.0
+MAX_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_SECONDS = 60.0
+# Seconds to wait before sending a duplicate of a slow hedgeable request; None disables hedging.
+HEDGE_AFTER_SECONDS: float | None = None
+# Minimum gap between the starts of two requests to one host; 0 disables pacing (backfills set it).
+HOST_INTERVAL_SECONDS = 0.0
+
+
+class DeadlineExceededError(RuntimeError):
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """Stops requests to a host after BREAKER_FAILURE_THRESHOLD transient failures in a row.
+
+    Once open, one probe request is let through per BREAKER_COOLDOWN_SECONDS; its success closes the breaker.
+    """
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self, now: float) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or now < self.opened_at + BREAKER_COOLDOWN_SECONDS:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self, now: float) -> bool:
+        """Count a transient failure; returns True if this failure opened the breaker."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.opened_at is None and self.failures < BREAKER_FAILURE_THRESHOLD:
+                return False
+            newly_opened = self.opened_at is None
+            self.opened_at = now
+            return newly_opened
+
+
+_deadline: float | None = None
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_next_slots: dict[str, float] = {}
+_next_slots_lock = threading.Lock()
+
+
+def start_run(budget_seconds: float | None) -> None:
+    """Start the run-wide budget that every request made from now on must fit into; None removes it."""
+    global _deadline
+    _deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+
+
+def remaining_seconds() -> float | None:
+    return None if _deadline is None else _deadline - time.monotonic()
+
+
+def breaker(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        host_breaker = _breakers.get(host)
+        if host_breaker is None:
+            host_breaker = _breakers[host] = CircuitBreaker(host)
+        return host_breaker
+
+
+def _wait_for_slot(host: str) -> None:
+    """Sleep until the host's next request slot, HOST_INTERVAL_SECONDS after the one before it."""
+    if HOST_INTERVAL_SECONDS <= 0:
+        return
+    with _next_slots_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slots.get(host, now))
+        _next_slots[host] = slot + HOST_INTERVAL_SECONDS
+    time.sleep(slot - now)
+
+
+def _is_transient(exc: Exception) -> bool:
+    # HTTPError is an OSError too, so the status decides before the generic network-error check.
+    if isinstance(exc, HTTPError):
+        return exc.code in RETRY_STATUSES
+    return isinstance(exc, (OSError, http.client.HTTPException))
+
+
+def _attempt_timeout(url: str, host: str, timeout: float) -> float:
+    remaining = remaining_seconds()
+    if remaining is None:
+        return timeout
+    if remaining < MIN_REQUEST_SECONDS:
+        metrics.record_fetch_event(host, "deadline_exceeded")
+        raise DeadlineExceededError(f"Run deadline reached; not fetching {url}")
+    return min(timeout, remaining)
+
+
+def _retry_delay(attempt: int, exc: Exception) -> float:
+    # Full jitter keeps clients that failed together from retrying together.
+    delay = random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1)))
+    retry_after = exc.headers.get("Retry-After", "") if isinstance(exc, HTTPError) and exc.headers else ""
+    if retry_after.strip().isdigit():
+        delay = max(delay, min(float(retry_after), RETRY_MAX_SECONDS))
+    return delay
+
+
+def _in_thread(call: Callable[[], http_client.Response]) -> Future:
+    future: Future = Future()
+
+    def target() -> None:
+        try:
+            future.set_result(call())
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    # Daemon threads: a losing hedge that is still downloading must not hold up interpreter exit.
+    threading.Thread(target=target, daemon=True).start()
+    return future
+
+
+class _CancellableScanner:
+    """Ends the read at the next chunk once `cancelled` is set; until then defers to the wrapped StopScanner."""
+
+    def __init__(self, scanner: http_client.StopScanner | None, cancelled: threading.Event) -> None:
+        self.scanner = scanner
+        self.cancelled = cancelled
+
+    def feed(self, body: bytearray) -> int | None:
+        if self.cancelled.is_set():
+            return 0
+        return None if self.scanner is None else self.scanner.feed(body)
+
+
+def _release_on_call(semaphore: threading.Semaphore, calls: int) -> Callable[[], None]:
+    """Return a function that releases `semaphore` on its `calls`-th call."""
+    remaining = calls
+    lock = threading.Lock()
+
+    def release() -> None:
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            if remaining:
+                return
+        semaphore.release()
+
+    return release
+
+
+def _hedged_get(
+    url: str,
+    host: str,
+    send: Callable[[float, threading.Event], http_client.Response],
+    timeout: float,
+) -> http_client.Response:
+    """Send the request and, if it has not finished after HEDGE_AFTER_SECONDS, a duplicate; the first success wins.
+
+    The duplicate waits for a fetch_stage slot of its own and holds it until both requests are done, so a
+    host never has more requests in flight than PER_HOST_LIMIT. The loser is told to stop reading, so it
+    ends at its next chunk instead of downloading the rest of the page.
+    """
+    cancelled = threading.Event()
+    primary = _in_thread(lambda: send(timeout, cancelled))
+    if wait([primary], timeout=HEDGE_AFTER_SECONDS).done:
+        return primary.result()
+
+    def send_hedge() -> http_client.Response:
+        semaphore = fetch_stage.host_semaphore(url)
+        if not semaphore.acquire(timeout=timeout):
+            raise TimeoutError(f"No free slot for {host} to hedge {url}")
+        release = _release_on_call(semaphore, 2)
+        primary.add_done_callback(lambda _: release())
+        try:
+            if cancelled.is_set():
+                raise TimeoutError(f"Hedge for {url} not needed any more")
+            metrics.record_fetch_event(host, "hedge")
+            return send(_attempt_timeout(url, host, timeout), cancelled)
+        finally:
+            release()
+
+    hedge = _in_thread(send_hedge)
+    pending = {primary, hedge}
+    error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                error = error or future.exception()
+                continue
+            cancelled.set()
+            if future is hedge:
+                metrics.record_fetch_event(host, "hedge_won")
+            return future.result()
+    raise error
+
+
+def get(
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    stop_at: Callable[[], http_client.StopScanner] | None = None,
+    max_body_bytes: int | None = None,
+    hedge: bool = False,
+) -> http_client.Response:
+    """http_client.get within the run deadline, behind the host's circuit breaker, with jittered retries.
+
+    Each attempt's timeout is `timeout` or what is left of the run budget, whichever is smaller. Network
+    errors and RETRY_STATUSES are retried up to MAX_ATTEMPTS times; other errors are raised at once. With
+    `hedge` and HEDGE_AFTER_SECONDS set, a slow attempt gets a duplicate request and the faster one is used.
+    """
+    host = urlsplit(url).netloc.lower()
+    host_breaker = breaker(host)
+
+    def send(attempt_timeout: float, cancelled: threading.Event | None = None) -> http_client.Response:
+        _wait_for_slot(host)
+        if cancelled is None:
+            return http_client.get(url, headers, attempt_timeout, stop_at, max_body_bytes)
+
+        def cancellable_scanner() -> _CancellableScanner:
+            return _CancellableScanner(stop_at() if stop_at is not None else None, cancelled)
+
+        return http_client.get(url, headers, attempt_timeout, cancellable_scanner, max_body_bytes)
+
+    for attempt in itertools.count(1):
+        if not host_breaker.allow(time.monotonic()):
+            metrics.record_fetch_event(host, "breaker_rejected")
+            raise CircuitOpenError(f"Circuit open for {host} after {host_breaker.failures} failures; not fetching {url}")
+        attempt_timeout = _attempt_timeout(url, host, timeout)
+        try:
+            if hedge and HEDGE_AFTER_SECONDS is not None:
+                response = _hedged_get(url, host, send, attempt_timeout)
+            else:
+                response = send(attempt_timeout)
+        except Exception as exc:
+            if not _is_transient(exc):
+                # The host answered; a 404 or an oversized body says nothing about its health.
+                host_breaker.record_success()
+                raise
+            if host_breaker.record_failure(time.monotonic()):
+                metrics.record_fetch_event(host, "breaker_opened")
+                print(f"[fetch] Circuit opened for {host} after {host_breaker.failures} failures in a row", file=sys.stderr)
+            delay = _retry_delay(attempt, exc)
+            remaining = remaining_seconds()
+            if attempt == MAX_ATTEMPTS or (remaining is not None and remaining < delay + MIN_REQUEST_SECONDS):
+                raise
+            metrics.record_fetch_event(host, "retry")
+            time.sleep(delay)
+            continue
+        host_breaker.record_success()
+        return response
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import profiling
+
+MAX_WORKERS = 8
+PER_HOST_LIMIT = 4
+
+# Shared across every scraper so concurrently running scrapers still respect the per-host cap together.
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def host_semaphore(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(PER_HOST_LIMIT)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+
+def fetch_pages(
+    urls: list[str],
+    fetch: Callable[[str], str],
+    label: str,
+    max_workers: int = MAX_WORKERS,
+) -> list[str | None]:
+    """Fetch article pages in parallel, returning bodies in the same order as `urls`.
+
+    A page that fails to download comes back as None so the caller can keep its fallback content.
+    """
+    # Downloads run in pool threads, so under --profile they are profiled as part of the calling source.
+    stage = profiling.current_stage()
+
+    def fetch_one(position: int) -> str | None:
+        url = urls[position]
+        with host_semaphore(url), profiling.profiled_thread(stage):
+            print(f"[{label}] [{position + 1}/{len(urls)}] Fetching content: {url}")
+            try:
+                return fetch(url)
+            except Exception as exc:
+                print(f"[{label}] Failed to fetch {url}: {exc}", file=sys.stderr)
+                return None
+
+    if not urls:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+        return list(executor.map(fetch_one, range(len(urls))))
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+import html
+import re
+from functools import lru_cache, partial
+
+BLOCK_TAGS = ("p", "div", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "ul", "ol", "blockquote")
+ARTICLE_BLOCK_TAGS = BLOCK_TAGS + ("section", "article")
+
+# Every token starts with `<` or a newline, so `re` can skip over plain text quickly. Entities and runs of
+# spaces or tabs are handled on the text chunks between tokens.
+HIDDEN_PATTERN = "|".join(
+    [
+        f"(?P<hidden>{'|'.join(rf'{name}.*?>.*?</{name}>' for name in ('script', 'style', 'noscript', 'svg'))})",
+        r"(?P<comment>!--.*?-->)",
+    ]
+)
+NEWLINE_PATTERN = r"\n(?P<newline>[ \t\n]*)"
+BREAK_PATTERN = re.compile(r"(?is)<br\s*/?>")
+HIDDEN_START_PATTERN = re.compile(r"(?i)<(?:script|style|noscript|svg)")
+SPACE_RUN_PATTERN = re.compile(r"[ \t]{2,}")
+# Same grammar html.unescape uses, so decoding one match at a time gives identical results.
+ENTITY_PATTERN = re.compile(r"&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)")
+# `&lt;` and `&gt;` stand for text even when entities are decoded before tags are stripped; the regex chain
+# holds them as two private-use characters that are not in the page until the tags are gone.
+PLACEHOLDER_CHARS = range(0xE000, 0xF900)
+# Decoded tags are only compared with the break and block patterns, so any two characters that are not `<>` do.
+TAG_PLACEHOLDERS = {"<": "\ue000", ">": "\ue001"}
+
+
+class _NeedsRegexChain(Exception):
+    """Raised for the rare inputs the single pass cannot tokenize like the regex chain does."""
+
+
+@lru_cache(maxsize=None)
+def _token_pattern(block_tags: tuple[str, ...], skip_hidden: bool) -> re.Pattern[str]:
+    tag_alternatives = [rf"(?P<block>/(?:{'|'.join(block_tags)})>|br\s*/?>)", r"(?P<tag>[^>]+>)"]
+    if skip_hidden:
+        tag_alternatives.insert(0, HIDDEN_PATTERN)
+    tags = f"<(?is:{'|'.join(tag_alternatives)})"
+    return re.compile(f"{tags}|{NEWLINE_PATTERN}")
+
+
+@lru_cache(maxsize=None)
+def _block_close_pattern(block_tags: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile(rf"(?is)</({'|'.join(block_tags)})>")
+
+
+def regex_chain_to_text(
+    markup: str,
+    block_tags: tuple[str, ...] = BLOCK_TAGS,
+    skip_hidden: bool = False,
+    entities_before_tags: bool = True,
+) -> str:
+    """Reference implementation: the chain of whole-document `re.sub` passes the scrapers used to run.
+
+    Unlike the old cleaners, `&lt;` and `&gt;` stay text with `entities_before_tags` instead of becoming tags.
+    """
+    if skip_hidden:
+        markup = re.sub(r"(?is)<(script|style|noscript|svg).*?>.*?</\1>", " ", markup)
+        markup = re.sub(r"(?is)<!--.*?-->", " ", markup)
+    placeholders = _placeholders(markup) if entities_before_tags else {}
+    if entities_before_tags:
+        markup = ENTITY_PATTERN.sub(partial(_decode_as_text, placeholders, {}), markup)
+    markup = BREAK_PATTERN.sub("\n", markup)
+    markup = _block_close_pattern(block_tags).sub("\n", markup)
+    text = re.sub(r"(?is)<[^>]+>", " ", markup)
+    if entities_before_tags:
+        text = re.sub(r"[ \t]+\n", "\n", text)
+        text = re.sub(r"[ \t]{2,}", " ", text)
+    else:
+        text = re.sub(r"[ \t]{2,}", " ", text)
+        text = html.unescape(text)
+        text = re.sub(r"[ \t]+\n", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    for char, placeholder in placeholders.items():
+        text = text.replace(placeholder, char)
+    return text.strip()
+
+
+def _placeholders(markup: str) -> dict[str, str]:
+    unused = (chr(code) for code in PLACEHOLDER_CHARS if chr(code) not in markup)
+    return {"<": next(unused), ">": next(unused)}
+
+
+def _decode_as_text(placeholders: dict[str, str], decoded: dict[str, str], match: re.Match[str]) -> str:
+    """Decode one entity into `decoded`, with any `<` or `>` it stands for replaced by its placeholder."""
+    entity = match.group()
+    if entity not in decoded:
+        # No entity name holds `>`, so one in the match (`&lt>`) is markup that follows an unterminated entity.
+        name, raw, rest = entity.partition(">")
+        text = html.unescape(name)
+        for char, placeholder in placeholders.items():
+            text = text.replace(char, placeholder)
+        decoded[entity] = text + raw + rest
+    return decoded[entity]
+
+
+_decode_in_tag = partial(_decode_as_text, TAG_PLACEHOLDERS, {})
+
+
+def _separator(newlines: int, space: str) -> str:
+    # One maximal whitespace run, given its newline count and the spaces/tabs after the last newline.
+    # Mirrors `[ \t]+\n` -> `\n`, `[ \t]{2,}` -> ` ` and `\n{3,}` -> `\n\n` on that run.
+    return "\n" * min(newlines, 2) + (" " if len(space) >= 2 else space)
+
+
+_decoded_entities: dict[str, str] = {}
+WHITESPACE_CHARS = frozenset(" \t\n")
+
+
+def _decode_entity(match: re.Match[str]) -> str:
+    # Entities never straddle a token (their names cannot hold `<`, spaces or newlines), but one that
+    # decodes to whitespace would change how the regex chain collapses the run around it.
+    entity = match.group()
+    decoded = _decoded_entities.get(entity)
+    if decoded is None:
+        decoded = html.unescape(entity)
+        if not WHITESPACE_CHARS.isdisjoint(decoded):
+            raise _NeedsRegexChain
+        _decoded_entities[entity] = decoded
+    return decoded
+
+
+def _text(chunk: str) -> str:
+    if "  " in chunk or "\t" in chunk:
+        chunk = SPACE_RUN_PATTERN.sub(" ", chunk)
+    if "&" in chunk:
+        chunk = ENTITY_PATTERN.sub(_decode_entity, chunk)
+    return chunk
+
+
+def _single_pass(markup: str, block_tags: tuple[str, ...], skip_hidden: bool, entities_before_tags: bool) -> str:
+    pattern = _token_pattern(block_tags, skip_hidden)
+    pieces: list[str] = []
+    position = 0
+    # The whitespace run that has not been written yet: newline count and spaces/tabs after the last newline.
+    # Text chunks never hold a newline, so a run only continues into them through leading/trailing spaces.
+    pending = False
+    pending_newlines = 0
+    pending_space = ""
+
+    for match in pattern.finditer(markup):
+        start, end = match.span()
+
+        if start > position:
+            chunk = markup[position:start]
+            text = chunk.strip(" \t")
+            if text:
+                if pending:
+                    pieces.append(_separator(pending_newlines, pending_space + chunk[: chunk.index(text[0])]))
+                if "&" in text or "  " in text or "\t" in text:
+                    text = _text(text)
+                pieces.append(text)
+                pending_newlines = 0
+                pending_space = chunk[len(chunk.rstrip(" \t")) :]
+            else:
+                pending_space += chunk
+            pending = True
+        position = end
+
+        kind = match.lastgroup
+        if kind == "tag":
+            if markup.find("<", start + 1, end) != -1:
+                raise _NeedsRegexChain
+            if entities_before_tags and markup.find("&", start, end) != -1:
+                # Decoded first, `<br&#32;/>` is still a break; a decoded `&gt;` inside a tag stays text in
+                # the regex chain too, so it cannot end the tag early.
+                decoded_tag = ENTITY_PATTERN.sub(_decode_in_tag, markup[start:end])
+                if BREAK_PATTERN.fullmatch(decoded_tag) or _block_close_pattern(block_tags).fullmatch(decoded_tag):
+                    pending = True
+                    pending_newlines += 1
+                    pending_space = ""
+                    continue
+            pending_space += " "
+        elif kind == "block":
+            pending_newlines += 1
+            pending_space = ""
+        elif kind == "newline":
+            run = markup[start:end]
+            pending_newlines += run.count("\n")
+            pending_space = run[run.rfind("\n") + 1 :]
+        else:
+            # The regex chain drops script blocks before comments, so a comment hiding a script tag
+            # could end somewhere else there.
+            if kind == "comment" and HIDDEN_START_PATTERN.search(markup, start, end):
+                raise _NeedsRegexChain
+            pending_space += " "
+        pending = True
+
+    if position < len(markup):
+        chunk = markup[position:]
+        text = chunk.lstrip(" \t")
+        if text:
+            if pending:
+                pieces.append(_separator(pending_newlines, pending_space + chunk[: len(chunk) - len(text)]))
+            pieces.append(_text(text))
+    return "".join(pieces).strip()
+
+
+def html_to_text(
+    markup: str,
+    block_tags: tuple[str, ...] = BLOCK_TAGS,
+    skip_hidden: bool = False,
+    entities_before_tags: bool = True,
+) -> str:
+    """Convert HTML to plain text in one tokenizing pass.
+
+    Tags become spaces, `<br>` and closing `block_tags` become newlines, entities are decoded, runs of
+    whitespace are collapsed (at most one blank line), and with `skip_hidden` script/style/noscript/svg
+    blocks and comments are dropped. The result matches `regex_chain_to_text` with the same arguments;
+    `entities_before_tags` reproduces the older cleaners that unescaped the markup before stripping tags,
+    except that `&lt;` and `&gt;` stay text. An entity that decodes to whitespace, a `<` inside a tag or a
+    comment hiding a script falls back to the regex chain, so those inputs pay for both passes.
+    """
+    try:
+        return _single_pass(markup, block_tags, skip_hidden, entities_before_tags)
+    except _NeedsRegexChain:
+        return regex_chain_to_text(markup, block_tags, skip_hidden, entities_before_tags)
+
+
+ARTICLE_OPEN_PATTERN = re.compile(r"<article", re.IGNORECASE)
+ARTICLE_CLOSE_PATTERN = re.compile(r"</article>", re.IGNORECASE)
+MAIN_OPEN_PATTERN = re.compile(r"<main", re.IGNORECASE)
+MAIN_CLOSE_PATTERN = re.compile(r"</main>", re.IGNORECASE)
+REGION_TAG_BYTES_PATTERN = re.compile(rb"<article|</article>|<main|</main>", re.IGNORECASE)
+LONGEST_REGION_TAG_BYTES = len(b"</article>")
+
+
+def _element(markup: str, open_pattern: re.Pattern[str], close_pattern: re.Pattern[str]) -> str | None:
+    opening = open_pattern.search(markup)
+    if opening is None:
+        return None
+    closing = close_pattern.search(markup, opening.start())
+    return markup[opening.start() : closing.end() if closing else len(markup)]
+
+
+def article_region(markup: str) -> str:
+    """Return the first `<article>` element, else the first `<main>` element, else the whole page.
+
+    An element without a closing tag runs to the end of the page. Tags are matched case-insensitively
+    without lowercasing a copy of the page.
+    """
+    region = _element(markup, ARTICLE_OPEN_PATTERN, ARTICLE_CLOSE_PATTERN)
+    if region is None:
+        region = _element(markup, MAIN_OPEN_PATTERN, MAIN_CLOSE_PATTERN)
+    return markup if region is None else region
+
+
+class ArticleRegionEnd:
+    """Tell a streaming download where `article_region()` stops needing more of the page.
+
+    `feed()` gets the body received so far and returns the byte offset just past the first `</article>`
+    after an `<article`, or past the first `</main>` after a `<main` when no `<article` has appeared,
+    or None to keep reading. An `<article>` that would only start after `</main>` is not waited for.
+    """
+
+    def __init__(self) -> None:
+        self._position = 0
+        self._in_article = False
+        self._in_main = False
+
+    def feed(self, body: bytes | bytearray) -> int | None:
+        for match in REGION_TAG_BYTES_PATTERN.finditer(body, self._position):
+            tag = match.group().lower()
+            if tag == b"<article":
+                self._in_article = True
+            elif tag == b"<main":
+                self._in_main = True
+            elif tag == b"</article>" and self._in_article:
+                return match.end()
+            elif tag == b"</main>" and self._in_main and not self._in_article:
+                return match.end()
+            self._position = match.end()
+        # A tag split across chunks is matched once the rest of it arrives.
+        self._position = max(self._position, len(body) - LONGEST_REGION_TAG_BYTES + 1)
+        return None
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.error import HTTPError
+
+import fetch_policy
+import http_client
+import metrics
+
+CACHE_DIR = Path(".cache") / "http"
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+# Eviction goes down to this share of MAX_CACHE_BYTES, so a full cache is not walked again on the next store.
+EVICT_TO_FRACTION = 0.9
+CACHE_ENABLED = True
+# Set by backfills: every stored entry counts as fresh and none is evicted, so a rerun replays
+# everything an interrupted one downloaded without a request.
+PINNED = False
+
+MAX_AGE_PATTERN = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    name: str
+    # Used when the response carries no Cache-Control max-age of its own.
+    default_ttl_seconds: int
+    # Slow requests may get a duplicate when hedging is on (fetch_policy.HEDGE_AFTER_SECONDS).
+    hedged: bool = False
+
+
+# Feeds and listing pages change several times a day; published articles rarely change at all.
+FEED_POLICY = CachePolicy("feed", 15 * 60)
+ARTICLE_POLICY = CachePolicy("article", 7 * 24 * 60 * 60, hedged=True)
+
+_eviction_lock = threading.Lock()
+# Body bytes per cache directory: counted by one walk of the directory, then kept up to date by each store,
+# so the directory is only walked again once the total goes over MAX_CACHE_BYTES.
+_body_bytes: dict[Path, int] = {}
+
+
+def _entry_paths(url: str) -> tuple[Path, Path]:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.json", CACHE_DIR / f"{key}.body"
+
+
+def _load_entry(url: str) -> tuple[dict, bytes] | None:
+    meta_path, body_path = _entry_paths(url)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        body = body_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+    if meta.get("url") != url:
+        return None
+    return meta, body
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _store_entry(meta: dict, body: bytes | None) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    meta_path, body_path = _entry_paths(meta["url"])
+    if body is not None:
+        try:
+            replaced_bytes = body_path.stat().st_size
+        except OSError:
+            replaced_bytes = 0
+        _write_atomic(body_path, body)
+    else:
+        # Revalidated entry: bump the body mtime so LRU eviction sees it as recently used.
+        _touch(body_path)
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    if body is not None:
+        _evict_if_needed(len(body) - replaced_bytes)
+
+
+def _evict_if_needed(added_bytes: int) -> None:
+    """Count `added_bytes` more of cached bodies and evict the least recently used entries when over the cap."""
+    if PINNED:
+        return
+    directory = CACHE_DIR.absolute()
+    with _eviction_lock:
+        total_bytes = _body_bytes.get(directory)
+        if total_bytes is not None:
+            total_bytes += added_bytes
+            if total_bytes <= MAX_CACHE_BYTES:
+                _body_bytes[directory] = total_bytes
+                return
+        _body_bytes[directory] = _evict_lru()
+
+
+def _evict_lru() -> int:
+    """Walk the cache and, if it is over MAX_CACHE_BYTES, delete the least recently used entries down to
+    EVICT_TO_FRACTION of it; returns the size left."""
+    bodies = []
+    total_bytes = 0
+    for body_path in CACHE_DIR.glob("*.body"):
+        try:
+            stat = body_path.stat()
+        except OSError:
+            continue
+        bodies.append((stat.st_mtime, stat.st_size, body_path))
+        total_bytes += stat.st_size
+
+    if total_bytes <= MAX_CACHE_BYTES:
+        return total_bytes
+    bodies.sort()
+    for _, size, body_path in bodies:
+        if total_bytes <= MAX_CACHE_BYTES * EVICT_TO_FRACTION:
+            break
+        body_path.unlink(missing_ok=True)
+        body_path.with_suffix(".json").unlink(missing_ok=True)
+        total_bytes -= size
+    return total_bytes
+
+
+def _freshness_seconds(cache_control: str, policy: CachePolicy) -> int | None:
+    """Return how long a response may be served without revalidation, or None if it must not be stored."""
+    directives = cache_control.lower()
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    match = MAX_AGE_PATTERN.search(cache_control)
+    if match:
+        return int(match.group(1))
+    return policy.default_ttl_seconds
+
+
+def _fetch_bytes(
+    url: str,
+    user_agent: str,
+    timeout: float,
+    policy: CachePolicy,
+    stop_at: Callable[[], http_client.StopScanner] | None = None,
+    max_body_bytes: int | None = None,
+) -> tuple[bytes, int, str]:
+    cached = _load_entry(url) if CACHE_ENABLED else None
+    if cached is not None and cached[0].get("truncated") and stop_at is None and max_body_bytes is None:
+        # Stored by a bounded read; a caller that wants the whole body must download it again.
+        cached = None
+    now = time.time()
+
+    if cached is not None:
+        meta, body = cached
+        if PINNED or now < meta["fetched_at"] + meta["freshness_seconds"]:
+            _touch(_entry_paths(url)[1])
+            return body, 200, "fresh"
+
+    headers = {"User-Agent": user_agent}
+    if cached is not None:
+        if cached[0].get("etag"):
+            headers["If-None-Match"] = cached[0]["etag"]
+        if cached[0].get("last_modified"):
+            headers["If-Modified-Since"] = cached[0]["last_modified"]
+
+    response = fetch_policy.get(url, headers, timeout, stop_at, max_body_bytes, hedge=policy.hedged)
+    if response.status == 304:
+        if cached is None:
+            raise HTTPError(url, 304, "Not Modified without a cached entry", response.headers, None)
+        meta, body = cached
+        freshness = _freshness_seconds(response.headers.get("Cache-Control", ""), policy)
+        meta["fetched_at"] = now
+        meta["freshness_seconds"] = freshness if freshness is not None else 0
+        _store_entry(meta, None)
+        return body, 304, "not_modified"
+
+    body = response.body
+    response_headers = response.headers
+    if CACHE_ENABLED:
+        freshness = _freshness_seconds(response_headers.get("Cache-Control", ""), policy)
+        if freshness is not None or PINNED:
+            meta = {
+                "url": url,
+                "policy": policy.name,
+                "etag": response_headers.get("ETag", ""),
+                "last_modified": response_headers.get("Last-Modified", ""),
+                "fetched_at": now,
+                "freshness_seconds": freshness or 0,
+                "truncated": response.truncated,
+            }
+            _store_entry(meta, body)
+    return body, response.status, "downloaded"
+
+
+def fetch_bytes(
+    url: str,
+    user_agent: str,
+    timeout: float,
+    policy: CachePolicy,
+    stop_at: Callable[[], http_client.StopScanner] | None = None,
+    max_body_bytes: int | None = None,
+) -> bytes:
+    """Return the body from the cache or the network; `stop_at`/`max_body_bytes` allow a prefix (see http_client.get)."""
+    started = time.perf_counter()
+    try:
+        body, status, outcome = _fetch_bytes(url, user_agent, timeout, policy, stop_at, max_body_bytes)
+    except HTTPError as exc:
+        metrics.record_fetch(url, exc.code, "error", 0, time.perf_counter() - started)
+        raise
+    except Exception:
+        metrics.record_fetch(url, 0, "error", 0, time.perf_counter() - started)
+        raise
+    metrics.record_fetch(url, status, outcome, len(body), time.perf_counter() - started)
+    return body
+
+
+def fetch_text(
+    url: str,
+    user_agent: str,
+    timeout: float,
+    policy: CachePolicy = FEED_POLICY,
+    stop_at: Callable[[], http_client.StopScanner] | None = None,
+    max_body_bytes: int | None = None,
+) -> str:
+    return fetch_bytes(url, user_agent, timeout, policy, stop_at, max_body_bytes).decode("utf-8", errors="replace")
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+import base64
+import http.client
+import ssl
+import threading
+import urllib.request
+import zlib
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.message import Message
+from typing import Protocol
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlsplit
+
+MAX_RESPONSE_BYTES = 20 * 1024 * 1024
+MAX_IDLE_PER_HOST = 4
+MAX_REDIRECTS = 5
+READ_CHUNK_BYTES = 64 * 1024
+# After a bounded read stops early, a leftover this small is read and dropped so the connection stays reusable.
+DRAIN_MAX_BYTES = 64 * 1024
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Errors that mean a pooled keep-alive connection was closed by the server while idle.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class ResponseTooLargeError(RuntimeError):
+    pass
+
+
+class StopScanner(Protocol):
+    def feed(self, body: bytearray) -> int | None:
+        """Given the decoded body so far, return the length to keep once nothing after it is needed."""
+
+
+@dataclass
+class Response:
+    url: str
+    status: int
+    headers: Message
+    body: bytes
+    # True when the body was cut short by a StopScanner or max_body_bytes.
+    truncated: bool = False
+
+
+@dataclass
+class _Proxy:
+    # host[:port] to connect to, and the Proxy-Authorization header when the proxy URL has credentials.
+    address: str
+    headers: dict[str, str]
+
+
+# Loading the CA store is the slowest part of startup, so it waits for the first HTTPS connection.
+_ssl_context: ssl.SSLContext | None = None
+_ssl_context_lock = threading.Lock()
+_idle_connections: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_pool_lock = threading.Lock()
+_bytes_by_host: Counter[str] = Counter()
+_bytes_lock = threading.Lock()
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    global _ssl_context
+    with _ssl_context_lock:
+        if _ssl_context is None:
+            _ssl_context = ssl.create_default_context()
+        return _ssl_context
+
+
+def _proxy_for(scheme: str, netloc: str) -> _Proxy | None:
+    """The proxy for `scheme`://`netloc` from HTTP_PROXY/HTTPS_PROXY and NO_PROXY, read the way urlopen reads them."""
+    proxy_url = urllib.request.getproxies().get(scheme)
+    if not proxy_url or urllib.request.proxy_bypass(netloc):
+        return None
+    parts = urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+    headers = {}
+    if parts.username is not None:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode("ascii")
+    return _Proxy(parts.netloc.rpartition("@")[2], headers)
+
+
+def _new_connection(scheme: str, netloc: str, timeout: float, proxy: _Proxy | None) -> http.client.HTTPConnection:
+    """Open a connection to `netloc`, or to `proxy` when one applies.
+
+    Like urlopen, HTTPS goes through the proxy in a CONNECT tunnel (TLS is end to end with the site) and
+    plain HTTP is sent to the proxy with the absolute URL as target, so the proxy URL's own scheme is not
+    used. Keeping http.client rather than falling back to urlopen keeps pooling and streamed reads.
+    """
+    if scheme == "https":
+        if proxy is None:
+            return http.client.HTTPSConnection(netloc, timeout=timeout, context=_get_ssl_context())
+        connection = http.client.HTTPSConnection(proxy.address, timeout=timeout, context=_get_ssl_context())
+        connection.set_tunnel(netloc, headers=proxy.headers)
+        return connection
+    if scheme == "http":
+        return http.client.HTTPConnection(proxy.address if proxy is not None else netloc, timeout=timeout)
+    raise ValueError(f"Unsupported URL scheme: {scheme}")
+
+
+def _checkout(key: tuple[str, str], timeout: float, proxy: _Proxy | None) -> tuple[http.client.HTTPConnection, bool]:
+    with _pool_lock:
+        idle = _idle_connections.get(key)
+        connection = idle.pop() if idle else None
+    if connection is None:
+        return _new_connection(*key, timeout, proxy), False
+
+    connection.timeout = timeout
+    if connection.sock is not None:
+        connection.sock.settimeout(timeout)
+    return connection, True
+
+
+def _checkin(key: tuple[str, str], connection: http.client.HTTPConnection) -> None:
+    with _pool_lock:
+        idle = _idle_connections.setdefault(key, [])
+        if len(idle) < MAX_IDLE_PER_HOST:
+            idle.append(connection)
+            return
+    connection.close()
+
+
+def _record_bytes(host: str, count: int) -> None:
+    with _bytes_lock:
+        _bytes_by_host[host] += count
+
+
+def bytes_downloaded() -> dict[str, int]:
+    """Return the number of bytes received on the wire per host since startup."""
+    with _bytes_lock:
+        return dict(_bytes_by_host)
+
+
+def close_all() -> None:
+    with _pool_lock:
+        connections = [connection for idle in _idle_connections.values() for connection in idle]
+        _idle_connections.clear()
+    for connection in connections:
+        connection.close()
+
+
+class _BodyDecoder:
+    """Undo the transfer Content-Encoding one network chunk at a time."""
+
+    def __init__(self, content_encoding: str, url: str) -> None:
+        self.url = url
+        self.encoding = content_encoding.strip().lower()
+        if self.encoding not in ("", "identity", "gzip", "x-gzip", "deflate"):
+            raise ValueError(f"Unsupported Content-Encoding {content_encoding!r} from {url}")
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if self.encoding in ("gzip", "x-gzip") else None
+        self._pending = b""
+        self._decoded_total = 0
+
+    def _decompress(self, data: bytes) -> bytes:
+        decoded = self._decompressor.decompress(data, MAX_RESPONSE_BYTES - self._decoded_total + 1)
+        self._decoded_total += len(decoded)
+        if self._decoded_total > MAX_RESPONSE_BYTES:
+            raise ResponseTooLargeError(f"Decompressed response from {self.url} exceeds {MAX_RESPONSE_BYTES} bytes.")
+        return decoded
+
+    def decode(self, chunk: bytes) -> bytes:
+        if self.encoding in ("", "identity"):
+            return chunk
+        if self._decompressor is None:
+            # Servers disagree on whether "deflate" means zlib-wrapped or raw; the header bytes tell them apart.
+            self._pending += chunk
+            if len(self._pending) < 2:
+                return b""
+            head = self._pending
+            zlib_wrapped = head[0] & 0x0F == 8 and (head[0] << 8 | head[1]) % 31 == 0
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS if zlib_wrapped else -zlib.MAX_WBITS)
+            chunk, self._pending = self._pending, b""
+        return self._decompress(chunk)
+
+    def flush(self) -> bytes:
+        if self._pending:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            pending, self._pending = self._pending, b""
+            return self._decompress(pending)
+        return b""
+
+
+def _read_body(
+    response: http.client.HTTPResponse,
+    url: str,
+    stop_scanner: StopScanner | None,
+    max_body_bytes: int | None,
+) -> tuple[bytes, int, bool]:
+    """Read and decode the body as it arrives; returns (body, bytes on the wire, truncated).
+
+    Reading stops early once `stop_scanner` has found the end of what the caller needs, or at
+    `max_body_bytes` of decoded body; the rest of the response is never transferred.
+    """
+    decoder = _BodyDecoder(response.headers.get("Content-Encoding", ""), url)
+    body = bytearray()
+    raw_total = 0
+    while True:
+        chunk = response.read(READ_CHUNK_BYTES)
+        raw_total += len(chunk)
+        if raw_total > MAX_RESPONSE_BYTES:
+            raise ResponseTooLargeError(f"Response from {url} exceeds {MAX_RESPONSE_BYTES} bytes.")
+        decoded = decoder.decode(chunk) if chunk else decoder.flush()
+        body += decoded
+        if decoded and stop_scanner is not None:
+            keep = stop_scanner.feed(body)
+            if keep is not None:
+                del body[keep:]
+                return bytes(body), raw_total, True
+        if max_body_bytes is not None and len(body) > max_body_bytes:
+            del body[max_body_bytes:]
+            return bytes(body), raw_total, True
+        if not chunk:
+            return bytes(body), raw_total, False
+
+
+def _drain(response: http.client.HTTPResponse) -> tuple[bool, int]:
+    """Discard what is left of a response if it fits in DRAIN_MAX_BYTES; returns (ended, bytes read)."""
+    if response.length is not None and response.length > DRAIN_MAX_BYTES:
+        return False, 0
+    drained = 0
+    while drained <= DRAIN_MAX_BYTES:
+        chunk = response.read(min(READ_CHUNK_BYTES, DRAIN_MAX_BYTES - drained + 1))
+        if not chunk:
+            return True, drained
+        drained += len(chunk)
+    return False, drained
+
+
+def _request_once(
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    stop_at: Callable[[], StopScanner] | None = None,
+    max_body_bytes: int | None = None,
+) -> Response:
+    parts = urlsplit(url)
+    key = (parts.scheme.lower(), parts.netloc.lower())
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+
+    request_headers = {"Accept-Encoding": "gzip, deflate", **headers}
+    proxy = _proxy_for(*key)
+    if proxy is not None and key[0] == "http":
+        target = f"http://{parts.netloc}{target}"
+        request_headers.update(proxy.headers)
+    connection, reused = _checkout(key, timeout, proxy)
+    try:
+        try:
+            connection.request("GET", target, headers=request_headers)
+            response = connection.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            if not reused:
+                raise
+            connection.close()
+            connection = _new_connection(*key, timeout, proxy)
+            connection.request("GET", target, headers=request_headers)
+            response = connection.getresponse()
+
+        stop_scanner = stop_at() if stop_at is not None and response.status < 300 else None
+        body, raw_length, truncated = _read_body(response, url, stop_scanner, max_body_bytes)
+        reusable = not response.will_close
+        if truncated and reusable:
+            reusable, drained = _drain(response)
+            raw_length += drained
+    except BaseException:
+        connection.close()
+        raise
+
+    _record_bytes(key[1], raw_length)
+    # A connection with unread body left on it cannot carry the next request.
+    if not reusable:
+        connection.close()
+    else:
+        _checkin(key, connection)
+    return Response(url=url, status=response.status, headers=response.headers, body=body, truncated=truncated)
+
+
+def get(
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    stop_at: Callable[[], StopScanner] | None = None,
+    max_body_bytes: int | None = None,
+) -> Response:
+    """GET `url` over a pooled keep-alive connection, following redirects.
+
+    Returns responses below 400 (including 304) and raises urllib's HTTPError for the rest, like `urlopen`.
+    With `stop_at` (a factory for a fresh StopScanner per response) or `max_body_bytes`, a successful
+    response body may be a prefix; `Response.truncated` says so.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        response = _request_once(url, headers, timeout, stop_at, max_body_bytes)
+        location = response.headers.get("Location")
+        if response.status in REDIRECT_STATUSES and location:
+            url = urljoin(url, location)
+            continue
+        if response.status >= 400:
+            raise HTTPError(url, response.status, http.client.responses.get(response.status, ""), response.headers, None)
+        return response
+    raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
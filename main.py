@@ -1,69 +1,517 @@
 #!/usr/bin/env python3
-import csv
-import json
+import argparse
+import heapq
+import signal
+import sqlite3
 import sys
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
 
-import anthropic_news_scraper
-import andon_labs_scraper
-import deepmind_blog_scraper
-import openai_news_scraper
-import technologyreview_scraper
-import xai_news_scraper
+import backfill
+import crawl_state
+import dedup
+import extraction_cache
+import extraction_pool
+import feed_record
+import feed_store
+import feed_writer
+import fetch_policy
+import http_cache
+import http_client
+import metrics
+import profiling
+import scheduler
+import source_registry
 
 OUTPUT_DIR = Path("output")
 COMBINED_OUTPUT_BASENAME = "combined_feed"
+COMBINED_FIELDS = ["title", "url", "date", "published_at", "content"]
 
-SCRAPERS = [
-    andon_labs_scraper,
-    technologyreview_scraper,
-    openai_news_scraper,
-    deepmind_blog_scraper,
-    anthropic_news_scraper,
-    xai_news_scraper,
-]
+PUBLISHED_AT = attrgetter("published_ts")
 
 
-def write_output(records: list[dict[str, str]], fields: list[str], basename: str) -> tuple[Path, Path]:
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def _field_list(text: str) -> list[str]:
+    fields = {field.strip() for field in text.split(",") if field.strip()}
+    unknown = sorted(fields - set(COMBINED_FIELDS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown field(s) {', '.join(unknown)}; choose from {', '.join(COMBINED_FIELDS)}")
+    return [field for field in COMBINED_FIELDS if field in fields]
 
-    json_path = OUTPUT_DIR / f"{basename}.json"
-    csv_path = OUTPUT_DIR / f"{basename}.csv"
 
-    json_path.write_text(json.dumps(records, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+def _day(text: str) -> date:
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a day as YYYY-MM-DD, got {text!r}") from None
 
-    with csv_path.open("w", newline="", encoding="utf-8") as file_obj:
-        writer = csv.DictWriter(file_obj, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(records)
 
-    return json_path, csv_path
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape recent AI news into one combined feed.")
+    parser.add_argument(
+        "--source",
+        dest="sources",
+        action="append",
+        metavar="NAME",
+        help="only run this source (repeatable); by default every enabled source in the config runs",
+    )
+    parser.add_argument(
+        "--sources-config",
+        type=Path,
+        default=source_registry.CONFIG_PATH,
+        metavar="PATH",
+        help=f"source registry to load (default: {source_registry.CONFIG_PATH.name} next to main.py)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of sources to run concurrently; 1 runs them serially (default: one per source)",
+    )
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        default=extraction_pool.WORKERS,
+        metavar="N",
+        help=(
+            "worker processes (threads on a free-threaded Python) that extract article text when a source has at least "
+            f"{extraction_pool.MIN_POOL_PAGES} new pages; 0 or 1 extracts in process (default: {extraction_pool.WORKERS}, the CPU count)"
+        ),
+    )
+    parser.add_argument(
+        "--fields",
+        type=_field_list,
+        metavar="LIST",
+        help=(
+            "comma-separated fields to write, e.g. title,url,date; without content, article pages are not fetched "
+            f"(default: {','.join(COMBINED_FIELDS)})"
+        ),
+    )
+    parser.add_argument(
+        "--since",
+        type=_day,
+        metavar="DAY",
+        help=(
+            "backfill: collect posts published from DAY (YYYY-MM-DD) instead of the last 30 days, following older "
+            f"feed and listing pages; an interrupted backfill resumes from its checkpoint in {backfill.CHECKPOINT_DIR}/"
+        ),
+    )
+    parser.add_argument(
+        "--until",
+        type=_day,
+        metavar="DAY",
+        help="last day (inclusive) of a --since backfill (default: today)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "total time budget for the run's requests; request timeouts shrink as it runs out and no request "
+            f"starts once it is spent, 0 for no budget (default: {fetch_policy.DEFAULT_RUN_BUDGET_SECONDS}; "
+            "per poll with --daemon; none for a backfill)"
+        ),
+    )
+    parser.add_argument(
+        "--hedge-after",
+        type=float,
+        metavar="SECONDS",
+        help="send a duplicate of an article request that has not finished after SECONDS and use whichever answers first",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            f"bypass the on-disk HTTP cache in {http_cache.CACHE_DIR}/ and the extraction cache in "
+            f"{extraction_cache.CACHE_DIR}/; always download and extract in full"
+        ),
+    )
+    parser.add_argument(
+        "--full-crawl",
+        action="store_true",
+        help="fetch every article page in the window instead of reusing content stored by earlier runs",
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=Path,
+        nargs="?",
+        const=feed_store.DEFAULT_DB_PATH,
+        metavar="PATH",
+        help=f"also upsert the records into a SQLite store with full-text search (default path: {feed_store.DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--source-order",
+        action="store_true",
+        help="write records grouped by source as each one finishes instead of merged newest-first at the end",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="write every record, even when its canonical URL or content duplicates an earlier one",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        type=Path,
+        default=OUTPUT_DIR,
+        help=(
+            f"where to write {metrics.JSON_REPORT_NAME} and the Prometheus textfile {metrics.PROMETHEUS_REPORT_NAME} "
+            f"(default: {OUTPUT_DIR}/)"
+        ),
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "keep running and poll each source on its own interval, adapted to how often it publishes; "
+            "output is rewritten only when a source's records change"
+        ),
+    )
+    parser.add_argument(
+        "--no-pretty-json",
+        action="store_true",
+        help="only write the streamed JSONL/CSV files and skip the final indented JSON pass",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="skip the memory-mappable record archive (combined_feed.records and its .idx index)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "run the sources one at a time under cProfile and tracemalloc and write a .pstats file, a top-functions "
+            "report and an allocation-site report per source and for the output stage to --profile-dir"
+        ),
+    )
+    parser.add_argument(
+        "--profile-sample",
+        type=float,
+        nargs="?",
+        const=profiling.DEFAULT_SAMPLE_INTERVAL_SECONDS * 1000,
+        metavar="MS",
+        help=(
+            "sample every thread's stack every MS milliseconds (default: "
+            f"{profiling.DEFAULT_SAMPLE_INTERVAL_SECONDS * 1000:g}) and write folded stacks for flame graphs to --profile-dir; "
+            "cheap enough for production runs and --daemon"
+        ),
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=OUTPUT_DIR / "profile",
+        metavar="DIR",
+        help=f"where --profile and --profile-sample write their reports (default: {OUTPUT_DIR / 'profile'}/)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.extract_workers < 0:
+        parser.error("--extract-workers must not be negative")
+    if args.fields is not None and "url" not in args.fields:
+        parser.error("--fields must include url")
+    if args.fields == COMBINED_FIELDS:
+        args.fields = None
+    if args.until is not None and args.since is None:
+        parser.error("--until needs --since")
+    if args.since is not None:
+        args.until = args.until or date.today()
+        if args.since > args.until:
+            parser.error("--since must not be after --until")
+        if args.daemon:
+            parser.error("--since cannot be combined with --daemon")
+        if args.no_cache:
+            parser.error("--since keeps its checkpoint in the HTTP cache and cannot be combined with --no-cache")
+    if args.deadline is None:
+        args.deadline = 0 if args.since is not None else fetch_policy.DEFAULT_RUN_BUDGET_SECONDS
+    if args.deadline < 0:
+        parser.error("--deadline must not be negative")
+    if args.hedge_after is not None and args.hedge_after <= 0:
+        parser.error("--hedge-after must be positive")
+    if args.profile and args.daemon:
+        parser.error("--profile covers a single run; use --profile-sample with --daemon")
+    if args.profile_sample is not None and args.profile_sample <= 0:
+        parser.error("--profile-sample must be positive")
+    return args
 
 
-def main() -> int:
-    had_any_success = False
-    combined_records: list[dict[str, str]] = []
-    combined_fields = andon_labs_scraper.FIELDS
-
-    for scraper in SCRAPERS:
-        name = scraper.__name__
-        print(f"Running scraper: {name}")
-        try:
-            records = scraper.run()
-            print(f"[{name}] Records: {len(records)}")
-            combined_records.extend(records)
-            had_any_success = True
-        except Exception as exc:
-            print(f"[{name}] ERROR: {exc}", file=sys.stderr)
+def _wants_content(args: argparse.Namespace) -> bool:
+    return args.fields is None or "content" in args.fields
+
+
+def _run_source(source, fields: list[str] | None = None) -> tuple[list[feed_record.Record] | None, float]:
+    name = source.name
+    print(f"Running source: {name}")
+    started = time.perf_counter()
+    try:
+        with profiling.profiled(name):
+            records = source.run(fields)
+    except Exception as exc:
+        elapsed = time.perf_counter() - started
+        print(f"[{name}] ERROR: {exc} ({elapsed:.2f}s)", file=sys.stderr)
+        metrics.record_scraper(name, elapsed, 0, succeeded=False)
+        return None, elapsed
+
+    elapsed = time.perf_counter() - started
+    metrics.record_scraper(name, elapsed, len(records), succeeded=True)
+    print(f"[{name}] Records: {len(records)} ({elapsed:.2f}s)")
+    return records, elapsed
+
+
+def _store_records(db_path: Path, stored_records: list[feed_record.Record], with_content: bool = True) -> bool:
+    """Upsert records into the SQLite store; returns False if the store failed.
+
+    Without `with_content` (a run that skipped article pages) stored rows keep their content.
+    """
+    try:
+        with metrics.stage("combined", "store"):
+            connection = feed_store.connect(db_path)
+            try:
+                stored_count = feed_store.upsert_records(connection, stored_records, with_content)
+            finally:
+                connection.close()
+    except (RuntimeError, sqlite3.Error) as exc:
+        print(f"[store] ERROR: {exc}", file=sys.stderr)
+        return False
+    print(f"[store] Upserted {stored_count} records into {db_path.resolve()}")
+    return True
+
+
+def _write_latest(latest_records: dict[str, list[feed_record.Record]], sources: list, args: argparse.Namespace) -> int:
+    """Rebuild the combined output from the latest records of every source; returns the record count."""
+    writer = feed_writer.StreamingFeedWriter(OUTPUT_DIR, COMBINED_OUTPUT_BASENAME, args.fields or COMBINED_FIELDS, archive=not args.no_archive)
+    deduplicator = None if args.no_dedup else dedup.Deduplicator()
+    source_streams: list[list[feed_record.Record]] = []
+    stored_records: list[feed_record.Record] = []
+    try:
+        for source in sources:
+            records = latest_records.get(source.name)
+            if records is None:
+                continue
+            if deduplicator is not None:
+                with metrics.stage("combined", "dedup"):
+                    records = deduplicator.filter(records)
+            if args.sqlite:
+                stored_records.extend(records)
+            source_streams.append(records if args.source_order else sorted(records, key=PUBLISHED_AT, reverse=True))
+        with metrics.stage("combined", "write"):
+            if args.source_order:
+                for records in source_streams:
+                    writer.write_records(records)
+            else:
+                writer.write_records(heapq.merge(*source_streams, key=PUBLISHED_AT, reverse=True))
+            writer.commit(pretty_json=not args.no_pretty_json)
+    except BaseException:
+        writer.abort()
+        raise
+
+    if deduplicator is not None:
+        print(f"[dedup] Dropped {len(deduplicator.merges)} duplicate records")
+        metrics.record_merges(deduplicator.merges)
+    if args.sqlite and stored_records:
+        _store_records(args.sqlite, stored_records, _wants_content(args))
+    print(f"[combined] Wrote {writer.count} records to {writer.jsonl_path.resolve()}")
+    return writer.count
+
+
+def _source_results(
+    executor: ThreadPoolExecutor,
+    sources: list,
+    args: argparse.Namespace,
+) -> Iterator[tuple[list[feed_record.Record] | None, float]]:
+    """Run the sources on `executor` and yield their results in config order.
+
+    Under --profile each source instead runs in this thread when its result is asked for, so it starts only
+    once the caller has finished with the previous one's records and its profile holds its own work alone.
+    """
+    run_source = partial(_run_source, fields=args.fields)
+    return map(run_source, sources) if args.profile else executor.map(run_source, sources)
+
+
+def _poll_due_sources(
+    due: list,
+    sources: list,
+    schedules: dict[str, scheduler.SourceSchedule],
+    latest_records: dict[str, list[feed_record.Record]],
+    executor: ThreadPoolExecutor,
+    args: argparse.Namespace,
+) -> None:
+    metrics.reset()
+    fetch_policy.start_run(args.deadline or None)
+    started = time.perf_counter()
+    changed: list[str] = []
+    for source, (records, _) in zip(due, _source_results(executor, due, args)):
+        name = source.name
+        schedule = schedules[name]
+        if records is None:
+            delay = schedule.record_failure(time.monotonic())
+            print(f"[daemon] {name}: failure {schedule.failures} in a row, retrying in {delay:.0f}s")
             continue
+        new_items = schedule.record_success(time.monotonic(), (record.url for record in records))
+        new_text = "first poll" if new_items is None else f"{new_items} new"
+        print(f"[daemon] {name}: {new_text}, next poll in {schedule.next_run_at - time.monotonic():.0f}s")
+        if records != latest_records.get(name):
+            latest_records[name] = records
+            changed.append(name)
+    scheduler.save_schedules(schedules)
+
+    # A failed poll leaves the source's previous records in place, so one outage does not empty the feed.
+    record_count = 0
+    if changed:
+        print(f"[daemon] Changed: {', '.join(changed)}")
+        record_count = _write_latest(latest_records, sources, args)
+    else:
+        print("[daemon] No source changed; output left as is")
+    for name, schedule in schedules.items():
+        metrics.record_schedule(name, schedule.interval, schedule.failures)
+    metrics.record_run(time.perf_counter() - started, record_count, bool(latest_records))
+    metrics.write_reports(args.metrics_dir)
+
+
+def run_daemon(sources: list, workers: int, args: argparse.Namespace) -> int:
+    """Poll each source when its schedule is due until SIGINT/SIGTERM; a poll in progress is finished first."""
+    schedules = scheduler.load_schedules([source.name for source in sources])
+    latest_records: dict[str, list[feed_record.Record]] = {}
+    stop = threading.Event()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: stop.set())
+
+    print(f"[daemon] Polling {len(sources)} sources; stop with Ctrl-C or SIGTERM")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while not stop.is_set():
+            now = time.monotonic()
+            due = [source for source in sources if schedules[source.name].due(now)]
+            if due:
+                _poll_due_sources(due, sources, schedules, latest_records, executor, args)
+            else:
+                stop.wait(min(schedule.next_run_at for schedule in schedules.values()) - now)
+    http_client.close_all()
+    print("[daemon] Stopped")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    metrics.reset()
+    http_cache.CACHE_ENABLED = not args.no_cache
+    extraction_cache.ENABLED = not args.no_cache
+    crawl_state.ENABLED = not args.full_crawl
+    fetch_policy.HEDGE_AFTER_SECONDS = args.hedge_after
+    extraction_pool.WORKERS = args.extract_workers
+    sources = source_registry.load_sources(args.sources_config, args.sources)
+    # Sources are network-bound, so by default every one of them gets its own worker. Under --profile they
+    # run one at a time in this thread (_source_results), because tracemalloc cannot tell threads apart.
+    workers = 1 if args.profile else args.workers or len(sources)
+    profiling.ENABLED = args.profile
+    profiling.reset()
+    sampler = None if args.profile_sample is None else profiling.Sampler(args.profile_sample / 1000).start()
+    basename = COMBINED_OUTPUT_BASENAME
+    if args.since is not None:
+        checkpoint_dir = backfill.start(args.since, args.until)
+        basename = f"{COMBINED_OUTPUT_BASENAME}_{args.since.isoformat()}_{args.until.isoformat()}"
+        print(f"[backfill] {args.since} to {args.until}; checkpoint in {checkpoint_dir.resolve()}")
+    try:
+        if args.daemon:
+            return run_daemon(sources, workers, args)
+        return run_once(sources, workers, args, basename)
+    finally:
+        backfill.finish()
+        extraction_pool.shutdown()
+        if args.profile:
+            for path in profiling.write_reports(args.profile_dir):
+                print(f"[profile] {path.resolve()}")
+        if sampler is not None:
+            sampler.stop()
+            print(f"[profile] {sampler.samples} samples: {sampler.write(args.profile_dir / 'samples.folded').resolve()}")
+            for frame, count in sampler.top_frames(5):
+                print(f"[profile] {count:>6} {frame}")
+
+
+def run_once(sources: list, workers: int, args: argparse.Namespace, basename: str) -> int:
+    """Run every source once and write the combined output; returns the exit code."""
+    had_any_success = False
+    writer = feed_writer.StreamingFeedWriter(OUTPUT_DIR, basename, args.fields or COMBINED_FIELDS, archive=not args.no_archive)
+    # Records arrive in config order, so of a duplicate group the record from the earliest source is kept.
+    deduplicator = None if args.no_dedup else dedup.Deduplicator()
+
+    fetch_policy.start_run(args.deadline or None)
+    started = time.perf_counter()
+    timings: list[tuple[str, float]] = []
+    source_streams: list[list[feed_record.Record]] = []
+    stored_records: list[feed_record.Record] = []
+    # Records wait here until every source is in; their content waits on disk instead of the heap.
+    spool = feed_record.ContentSpool()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Results come in config order, so the output does not depend on which source finishes first.
+            # With --source-order each source's records are streamed to disk as soon as every source before it
+            # is done; otherwise each source is sorted newest-first on its own and k-way merged once all are in.
+            for source, (records, elapsed) in zip(sources, _source_results(executor, sources, args)):
+                timings.append((source.name, elapsed))
+                if records is None:
+                    continue
+                if deduplicator is not None:
+                    with metrics.stage("combined", "dedup"):
+                        records = deduplicator.filter(records)
+                if args.sqlite:
+                    stored_records.extend(records)
+                if args.source_order:
+                    with metrics.stage("combined", "write"):
+                        writer.write_records(records)
+                else:
+                    spool.spill(records)
+                    source_streams.append(sorted(records, key=PUBLISHED_AT, reverse=True))
+                had_any_success = True
+        if source_streams:
+            # heapq.merge is stable, so records with the same timestamp stay in config order.
+            with metrics.stage("combined", "write"), profiling.profiled("output"):
+                writer.write_records(heapq.merge(*source_streams, key=PUBLISHED_AT, reverse=True))
+    except BaseException:
+        writer.abort()
+        raise
+    wall_time = time.perf_counter() - started
+
+    for name, elapsed in timings:
+        print(f"[timing] {name}: {elapsed:.2f}s")
+    serial_time = sum(elapsed for _, elapsed in timings)
+    print(f"[timing] wall: {wall_time:.2f}s with {workers} worker(s), sum of sources: {serial_time:.2f}s")
+    for host, byte_count in sorted(http_client.bytes_downloaded().items()):
+        print(f"[network] {host}: {byte_count} bytes downloaded")
+    http_client.close_all()
+    if deduplicator is not None:
+        for merge in deduplicator.merges:
+            print(f"[dedup] {merge['dropped_url']} -> {merge['kept_url']} ({merge['reason']}, {merge['similarity']})")
+        print(f"[dedup] Dropped {len(deduplicator.merges)} duplicate records")
+        metrics.record_merges(deduplicator.merges)
 
     if had_any_success:
-        json_path, csv_path = write_output(combined_records, combined_fields, COMBINED_OUTPUT_BASENAME)
-        print(f"[combined] Records: {len(combined_records)}")
-        print(f"[combined] JSON: {json_path.resolve()}")
-        print(f"[combined] CSV:  {csv_path.resolve()}")
+        with metrics.stage("combined", "write"), profiling.profiled("output"):
+            writer.commit(pretty_json=not args.no_pretty_json)
+    else:
+        writer.abort()
+
+    store_failed = bool(args.sqlite and stored_records) and not _store_records(args.sqlite, stored_records, _wants_content(args))
+    spool.close()
+    metrics.record_run(time.perf_counter() - started, writer.count if had_any_success else 0, had_any_success)
+    metrics_json_path, metrics_prometheus_path = metrics.write_reports(args.metrics_dir)
+    print(f"[metrics] JSON: {metrics_json_path.resolve()}")
+    print(f"[metrics] Prometheus: {metrics_prometheus_path.resolve()}")
+
+    if not had_any_success:
+        return 1
 
-    return 0 if had_any_success else 1
+    print(f"[combined] Records: {writer.count}")
+    print(f"[combined] JSONL: {writer.jsonl_path.resolve()}")
+    if not args.no_pretty_json:
+        print(f"[combined] JSON: {writer.json_path.resolve()}")
+    print(f"[combined] CSV:  {writer.csv_path.resolve()}")
+    if not args.no_archive:
+        print(f"[combined] Archive: {writer.archive_path.resolve()}")
+    return 1 if store_failed else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+JSON_REPORT_NAME = "metrics.json"
+# node_exporter's textfile collector picks up *.prom files from the directory it is pointed at.
+PROMETHEUS_REPORT_NAME = "news_aggregator.prom"
+METRIC_PREFIX = "news_aggregator"
+
+_lock = threading.Lock()
+_started_at = time.time()
+_fetches: list[dict] = []
+_stages: dict[tuple[str, str], list[float]] = {}
+_scrapers: dict[str, dict] = {}
+_run: dict = {}
+_merges: list[dict] = []
+_schedules: dict[str, dict] = {}
+_fetch_events: dict[tuple[str, str], int] = {}
+
+
+def reset() -> None:
+    global _started_at
+    with _lock:
+        _started_at = time.time()
+        _fetches.clear()
+        _stages.clear()
+        _scrapers.clear()
+        _run.clear()
+        _merges.clear()
+        _schedules.clear()
+        _fetch_events.clear()
+
+
+def record_fetch(url: str, status: int, outcome: str, response_bytes: int, seconds: float) -> None:
+    """Record one fetch; `outcome` is fresh (served from cache), not_modified, downloaded or error."""
+    fetch = {
+        "url": url,
+        "host": urlsplit(url).netloc,
+        "status": status,
+        "outcome": outcome,
+        "bytes": response_bytes,
+        "seconds": round(seconds, 6),
+    }
+    with _lock:
+        _fetches.append(fetch)
+
+
+def record_fetch_event(host: str, event: str) -> None:
+    """Count a fetch policy event for a host: retry, hedge, hedge_won, breaker_opened, breaker_rejected or deadline_exceeded."""
+    with _lock:
+        _fetch_events[(host, event)] = _fetch_events.get((host, event), 0) + 1
+
+
+@contextmanager
+def stage(source: str, stage_name: str) -> Iterator[None]:
+    """Add the time spent in the block to the (source, stage) total, e.g. ("xai_news", "parse")."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            totals = _stages.setdefault((source, stage_name), [0.0, 0])
+            totals[0] += elapsed
+            totals[1] += 1
+
+
+def record_scraper(name: str, seconds: float, records: int, succeeded: bool) -> None:
+    with _lock:
+        _scrapers[name] = {"seconds": round(seconds, 6), "records": records, "succeeded": succeeded}
+
+
+def record_run(seconds: float, records: int, succeeded: bool) -> None:
+    with _lock:
+        _run.update({"seconds": round(seconds, 6), "records": records, "succeeded": succeeded})
+
+
+def record_merges(merges: list[dict]) -> None:
+    with _lock:
+        _merges.extend(merges)
+
+
+def record_schedule(source: str, interval_seconds: float, failures: int) -> None:
+    """Record a daemon source's current polling interval and consecutive failure count."""
+    with _lock:
+        _schedules[source] = {"interval_seconds": round(interval_seconds, 1), "failures": failures}
+
+
+def snapshot() -> dict:
+    with _lock:
+        fetches = list(_fetches)
+        stages = [
+            {"source": source, "stage": stage_name, "seconds": round(seconds, 6), "calls": calls}
+            for (source, stage_name), (seconds, calls) in sorted(_stages.items())
+        ]
+        scrapers = dict(_scrapers)
+        run = dict(_run)
+        merges = list(_merges)
+        schedules = dict(_schedules)
+        fetch_events: dict[str, dict[str, int]] = {}
+        for (host, event), count in sorted(_fetch_events.items()):
+            fetch_events.setdefault(host, {})[event] = count
+        started_at = _started_at
+
+    hosts: dict[str, dict] = {}
+    for fetch in fetches:
+        host = hosts.setdefault(fetch["host"], {"fetches": 0, "bytes": 0, "seconds": 0.0, "max_seconds": 0.0})
+        host["fetches"] += 1
+        host["bytes"] += fetch["bytes"]
+        host["seconds"] = round(host["seconds"] + fetch["seconds"], 6)
+        host["max_seconds"] = max(host["max_seconds"], fetch["seconds"])
+
+    return {
+        "started_at": datetime.fromtimestamp(started_at, timezone.utc).isoformat(),
+        "run": run,
+        "scrapers": scrapers,
+        "stages": stages,
+        "hosts": dict(sorted(hosts.items())),
+        "fetches": fetches,
+        "dedup_merges": merges,
+        "schedules": schedules,
+        "fetch_events": fetch_events,
+    }
+
+
+def _labels(**labels: object) -> str:
+    parts = []
+    for name, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def prometheus_text(report: dict) -> str:
+    """Render a snapshot in the Prometheus text exposition format.
+
+    Everything is a gauge describing the last run; per-URL detail stays in the JSON report to keep label
+    cardinality down.
+    """
+    samples: dict[str, tuple[str, list[str]]] = {}
+
+    def add(name: str, help_text: str, value: float, **labels: object) -> None:
+        metric = f"{METRIC_PREFIX}_{name}"
+        samples.setdefault(metric, (help_text, []))[1].append(f"{metric}{_labels(**labels) if labels else ''} {value}")
+
+    run = report["run"]
+    add("last_run_timestamp_seconds", "Unix time the last run started.", round(datetime.fromisoformat(report["started_at"]).timestamp(), 3))
+    if run:
+        add("run_seconds", "Wall time of the last run.", run["seconds"])
+        add("run_records", "Records written by the last run.", run["records"])
+        add("run_success", "1 if the last run wrote output.", int(run["succeeded"]))
+
+    for name, scraper in sorted(report["scrapers"].items()):
+        add("scraper_seconds", "Wall time of each scraper's run().", scraper["seconds"], scraper=name)
+        add("scraper_records", "Records returned by each scraper.", scraper["records"], scraper=name)
+        add("scraper_success", "1 if the scraper returned records.", int(scraper["succeeded"]), scraper=name)
+
+    for entry in report["stages"]:
+        add("stage_seconds", "Time spent per source and stage.", entry["seconds"], source=entry["source"], stage=entry["stage"])
+        add("stage_calls", "Times each source stage ran.", entry["calls"], source=entry["source"], stage=entry["stage"])
+
+    for name, schedule in sorted(report["schedules"].items()):
+        add("source_poll_interval_seconds", "Current daemon polling interval per source.", schedule["interval_seconds"], source=name)
+        add("source_consecutive_failures", "Failed daemon polls in a row per source.", schedule["failures"], source=name)
+
+    merge_counts: dict[str, int] = {}
+    for merge in report["dedup_merges"]:
+        merge_counts[merge["reason"]] = merge_counts.get(merge["reason"], 0) + 1
+    for reason in ("url", "content"):
+        add("dedup_dropped_records", "Records dropped as duplicates, by match reason.", merge_counts.get(reason, 0), reason=reason)
+
+    fetch_counts: dict[tuple[str, int, str], int] = {}
+    for fetch in report["fetches"]:
+        key = (fetch["host"], fetch["status"], fetch["outcome"])
+        fetch_counts[key] = fetch_counts.get(key, 0) + 1
+    for (host, status, outcome), count in sorted(fetch_counts.items()):
+        add("fetches", "Fetches by host, HTTP status and cache outcome.", count, host=host, status=status, outcome=outcome)
+    for host, totals in report["hosts"].items():
+        add("fetch_bytes", "Response body bytes returned per host.", totals["bytes"], host=host)
+        add("fetch_seconds_sum", "Total fetch latency per host.", totals["seconds"], host=host)
+        add("fetch_seconds_max", "Slowest fetch per host.", totals["max_seconds"], host=host)
+    for host, events in report["fetch_events"].items():
+        for event, count in events.items():
+            add("fetch_events", "Retries, hedged requests, circuit breaker and deadline events per host.", count, host=host, event=event)
+
+    lines = []
+    for metric, (help_text, metric_samples) in samples.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(metric_samples)
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def write_reports(directory: Path) -> tuple[Path, Path]:
+    """Write the JSON report and the Prometheus textfile for this run; returns both paths."""
+    report = snapshot()
+    directory.mkdir(parents=True, exist_ok=True)
+    json_path = directory / JSON_REPORT_NAME
+    prometheus_path = directory / PROMETHEUS_REPORT_NAME
+    _write_atomic(json_path, json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    # The textfile collector may read at any moment, so it must never see a half-written file.
+    _write_atomic(prometheus_path, prometheus_text(report))
+    return json_path, prometheus_path
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Set by main.py --profile: every profiled() block gets cProfile and tracemalloc.
+ENABLED = False
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 40
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.01
+
+_lock = threading.Lock()
+# Per stage name: its profiler, peak traced bytes above the block's start, and allocation growth per site.
+_profiles: dict[str, cProfile.Profile] = {}
+_peaks: dict[str, int] = {}
+_allocations: dict[str, Counter] = {}
+_allocation_counts: dict[str, Counter] = {}
+# Per stage name: profilers of helper threads that did work for it, merged into its report (see profiled_thread()).
+_thread_profiles: dict[str, list[cProfile.Profile]] = {}
+# The name of the profiled() block running in this thread, if any.
+_current = threading.local()
+
+
+def reset() -> None:
+    with _lock:
+        _profiles.clear()
+        _peaks.clear()
+        _allocations.clear()
+        _allocation_counts.clear()
+        _thread_profiles.clear()
+
+
+@contextmanager
+def profiled(name: str) -> Iterator[None]:
+    """Profile the block with cProfile (this thread, plus profiled_thread() helpers) and tracemalloc when ENABLED.
+
+    Blocks with the same name add up. tracemalloc cannot tell threads apart, so blocks are only
+    attributed correctly when they do not overlap; main.py runs sources one at a time under --profile.
+    """
+    if not ENABLED:
+        yield
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    snapshot_before = tracemalloc.take_snapshot()
+    with _lock:
+        profile = _profiles.setdefault(name, cProfile.Profile())
+    outer_name = current_stage()
+    _current.name = name
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        _current.name = outer_name
+        peak = tracemalloc.get_traced_memory()[1] - traced_before
+        growth = tracemalloc.take_snapshot().compare_to(snapshot_before, "lineno")
+        with _lock:
+            _peaks[name] = max(_peaks.get(name, 0), peak)
+            sizes = _allocations.setdefault(name, Counter())
+            counts = _allocation_counts.setdefault(name, Counter())
+            for stat in growth:
+                frame = stat.traceback[0]
+                site = f"{frame.filename}:{frame.lineno}"
+                sizes[site] += stat.size_diff
+                counts[site] += stat.count_diff
+
+
+def current_stage() -> str | None:
+    """The name of the profiled() block running in this thread, to hand to profiled_thread() in helpers."""
+    return getattr(_current, "name", None)
+
+
+@contextmanager
+def profiled_thread(name: str | None) -> Iterator[None]:
+    """Profile a helper thread's block with cProfile as part of stage `name` when ENABLED and `name` is set.
+
+    cProfile only sees the thread that enabled it, so work that a profiled() block hands to other threads
+    needs this to appear in the stage's report. tracemalloc already sees every thread.
+    """
+    if not ENABLED or name is None:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        with _lock:
+            _thread_profiles.setdefault(name, []).append(profile)
+
+
+def _is_own_file(filename: str) -> bool:
+    return filename in (__file__, tracemalloc.__file__)
+
+
+def write_reports(directory: Path) -> list[Path]:
+    """Write `<name>.pstats`, `<name>.txt` (top functions) and `<name>.alloc.txt` for every profiled stage."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    with _lock:
+        stages = sorted(_profiles)
+        for name in stages:
+            stats_path = directory / f"{name}.pstats"
+            merged = pstats.Stats(_profiles[name])
+            for profile in _thread_profiles.get(name, []):
+                merged.add(profile)
+            merged.dump_stats(stats_path)
+            with open(directory / f"{name}.txt", "w", encoding="utf-8") as report:
+                stats = pstats.Stats(str(stats_path), stream=report)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+
+            allocations = _allocations.get(name, Counter()).most_common()
+            sites = [(site, size) for site, size in allocations if not _is_own_file(site.rsplit(":", 1)[0])]
+            lines = [
+                f"{name}: peak {_peaks.get(name, 0) / 1024:.1f} KiB traced above the start of the stage",
+                f"top {TOP_ALLOCATIONS} allocation sites by memory still held at the end of the stage:",
+            ]
+            for site, size in sites[:TOP_ALLOCATIONS]:
+                lines.append(f"{size / 1024:>10.1f} KiB {_allocation_counts[name][site]:>8} blocks  {site}")
+            alloc_path = directory / f"{name}.alloc.txt"
+            alloc_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            paths.extend((stats_path, alloc_path))
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return paths
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    # co_qualname is new in Python 3.11.
+    return f"{os.path.basename(code.co_filename).removesuffix('.py')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class Sampler:
+    """Records every thread's stack each `interval_seconds` from a daemon thread, for flame graphs.
+
+    Only frames are read, nothing is traced, so the cost is one stack walk per thread per interval and
+    nothing at all between samples. Threads that wait count too, so the result is a wall-clock profile.
+    """
+
+    def __init__(self, interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS) -> None:
+        self.interval_seconds = interval_seconds
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> "Sampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(thread_names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path: Path) -> Path:
+        """Write the samples in the folded-stack format read by flamegraph.pl and speedscope."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}" for stack, count in sorted(self.stacks.items())]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    def top_frames(self, count: int = 10) -> list[tuple[str, int]]:
+        """The innermost frames that were on top of the most samples."""
+        leaves: Counter = Counter()
+        for stack, samples in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += samples
+        return leaves.most_common(count)
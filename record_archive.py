@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+# Data file: header, then one (u32 length, compact JSON) frame per record in feed order.
+DATA_MAGIC = b"NAREC001"
+# Index file: header, then the same entries twice, sorted by URL hash and by published_at.
+INDEX_MAGIC = b"NAIDX001"
+ARCHIVE_ID_BYTES = 16
+DATA_HEADER = struct.Struct(f"<8s{ARCHIVE_ID_BYTES}s")
+INDEX_HEADER = struct.Struct(f"<8s{ARCHIVE_ID_BYTES}sQ")
+FRAME_LENGTH = struct.Struct("<I")
+URL_ENTRY = struct.Struct("<QQI")
+# published_at is fixed-width ISO-8601 ("2025-01-31T09:30:00Z"), so the raw bytes sort chronologically.
+PUBLISHED_AT_BYTES = 20
+DATE_ENTRY = struct.Struct(f"<{PUBLISHED_AT_BYTES}sQI")
+
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def index_path_for(data_path: Path) -> Path:
+    return data_path.with_name(f"{data_path.name}.idx")
+
+
+class RecordArchiveWriter:
+    """Append records to `<path>.partial` and its index in memory; `commit()` moves both into place.
+
+    Both files carry the same random archive id, so a reader that opens them while a commit swaps them
+    notices the mismatch instead of following offsets into the wrong file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.index_path = index_path_for(path)
+        self.count = 0
+        self._archive_id = os.urandom(ARCHIVE_ID_BYTES)
+        self._partial_path = path.with_name(f"{path.name}.partial")
+        self._partial_index_path = self.index_path.with_name(f"{self.index_path.name}.partial")
+        self._entries: list[tuple[int, bytes, int, int]] = []
+        self._file = self._partial_path.open("wb")
+        self._file.write(DATA_HEADER.pack(DATA_MAGIC, self._archive_id))
+        self._offset = DATA_HEADER.size
+
+    def append(self, record: dict[str, str]) -> None:
+        payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._file.write(FRAME_LENGTH.pack(len(payload)))
+        self._file.write(payload)
+        published_at = record.get("published_at", "").encode("ascii", "replace")[:PUBLISHED_AT_BYTES]
+        self._entries.append((url_hash(record["url"]), published_at, self._offset + FRAME_LENGTH.size, len(payload)))
+        self._offset += FRAME_LENGTH.size + len(payload)
+        self.count += 1
+
+    def commit(self) -> None:
+        self._file.close()
+        with self._partial_index_path.open("wb") as index_file:
+            index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, self._archive_id, len(self._entries)))
+            for hashed, _, offset, length in sorted(self._entries, key=lambda entry: entry[0]):
+                index_file.write(URL_ENTRY.pack(hashed, offset, length))
+            for _, published_at, offset, length in sorted(self._entries, key=lambda entry: entry[1]):
+                index_file.write(DATE_ENTRY.pack(published_at, offset, length))
+        os.replace(self._partial_path, self.path)
+        os.replace(self._partial_index_path, self.index_path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._partial_path.unlink(missing_ok=True)
+        self._partial_index_path.unlink(missing_ok=True)
+
+
+def _map(path: Path) -> mmap.mmap:
+    with path.open("rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class RecordArchive:
+    """Read-only, memory-mapped view of an archive written by RecordArchiveWriter.
+
+    Lookups binary-search the mapped index and decode only the records they return, so the cost of
+    opening the archive does not grow with the size of the content stored in it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._data = _map(path)
+        try:
+            self._index = _map(index_path_for(path))
+        except BaseException:
+            self._data.close()
+            raise
+        data_magic, data_id = DATA_HEADER.unpack_from(self._data)
+        index_magic, index_id, self._count = INDEX_HEADER.unpack_from(self._index)
+        if data_magic != DATA_MAGIC or index_magic != INDEX_MAGIC:
+            self.close()
+            raise RuntimeError(f"{path} is not a record archive")
+        if data_id != index_id:
+            self.close()
+            raise RuntimeError(f"{path} and its index belong to different runs; the archive is being replaced, retry")
+        self._url_entries_at = INDEX_HEADER.size
+        self._date_entries_at = self._url_entries_at + self._count * URL_ENTRY.size
+
+    def __enter__(self) -> "RecordArchive":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._data.close()
+        self._index.close()
+
+    def _decode(self, offset: int, length: int) -> dict[str, str]:
+        return json.loads(self._data[offset : offset + length])
+
+    def _url_entry(self, position: int) -> tuple[int, int, int]:
+        return URL_ENTRY.unpack_from(self._index, self._url_entries_at + position * URL_ENTRY.size)
+
+    def _date_entry(self, position: int) -> tuple[bytes, int, int]:
+        return DATE_ENTRY.unpack_from(self._index, self._date_entries_at + position * DATE_ENTRY.size)
+
+    def _first_date_at_or_after(self, published_at: str) -> int:
+        key = published_at.encode("ascii", "replace")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._date_entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get(self, url: str) -> dict[str, str] | None:
+        """Return the record with exactly this URL, or None."""
+        target = url_hash(url)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._url_entry(middle)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        # Records whose URLs share a 64-bit hash sit next to each other; the decoded URL settles it.
+        while low < self._count:
+            hashed, offset, length = self._url_entry(low)
+            if hashed != target:
+                break
+            record = self._decode(offset, length)
+            if record.get("url") == url:
+                return record
+            low += 1
+        return None
+
+    def between(self, since: str | None = None, until: str | None = None) -> Iterator[dict[str, str]]:
+        """Yield records with since <= published_at < until, newest first.
+
+        Bounds compare as text like feed_store.search, so "2025-01-31" and full timestamps both work.
+        """
+        start = self._first_date_at_or_after(since) if since else 0
+        stop = self._first_date_at_or_after(until) if until else self._count
+        for position in range(stop - 1, start - 1, -1):
+            _, offset, length = self._date_entry(position)
+            yield self._decode(offset, length)
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        """Yield every record in feed order."""
+        offset = DATA_HEADER.size
+        end = len(self._data)
+        while offset < end:
+            (length,) = FRAME_LENGTH.unpack_from(self._data, offset)
+            offset += FRAME_LENGTH.size
+            yield self._decode(offset, length)
+            offset += length
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Read records from the combined feed archive without loading the JSON output.")
+    parser.add_argument("path", type=Path, nargs="?", default=Path("output") / "combined_feed.records")
+    parser.add_argument("--url", help="print the record with this URL")
+    parser.add_argument("--since", help="earliest published_at, e.g. 2025-01-01")
+    parser.add_argument("--until", help="published_at upper bound (exclusive)")
+    args = parser.parse_args(argv)
+
+    if not args.path.exists():
+        print(f"No record archive at {args.path}", file=sys.stderr)
+        return 1
+    with RecordArchive(args.path) as archive:
+        if args.url:
+            record = archive.get(args.url)
+            if record is None:
+                print(f"No record for {args.url}", file=sys.stderr)
+                return 1
+            records = [record]
+        else:
+            records = archive.between(args.since, args.until)
+        for record in records:
+            print(json.dumps(record, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
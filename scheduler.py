@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import json
+import os
+import random
+from collections.abc import Iterable
+from pathlib import Path
+
+import http_cache
+
+STATE_PATH = Path(".cache") / "scheduler.json"
+
+DEFAULT_INTERVAL_SECONDS = 60 * 60
+# Listings are cached for the feed TTL, so polling more often than that would only re-read the cache.
+MIN_INTERVAL_SECONDS = http_cache.FEED_POLICY.default_ttl_seconds
+MAX_INTERVAL_SECONDS = 24 * 60 * 60
+# A poll that finds new posts halves the interval; each poll that finds nothing stretches it by half.
+SPEEDUP_FACTOR = 0.5
+SLOWDOWN_FACTOR = 1.5
+# Polls land up to this fraction after their interval so that sources drift apart instead of firing together.
+INTERVAL_JITTER = 0.1
+FAILURE_BACKOFF_SECONDS = 5 * 60
+MAX_FAILURE_BACKOFF_SECONDS = 6 * 60 * 60
+
+
+class SourceSchedule:
+    """Polling interval of one source, adapted to how often the source publishes new posts.
+
+    Times are `time.monotonic()` values; only the interval and the URLs seen are kept across restarts.
+    """
+
+    def __init__(self, name: str, interval: float = DEFAULT_INTERVAL_SECONDS, known_urls: list[str] | None = None) -> None:
+        self.name = name
+        self.interval = min(max(interval, MIN_INTERVAL_SECONDS), MAX_INTERVAL_SECONDS)
+        self.known_urls = set(known_urls) if known_urls is not None else None
+        self.next_run_at = 0.0
+        self.failures = 0
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_run_at
+
+    def record_success(self, now: float, urls: Iterable[str]) -> int | None:
+        """Adapt the interval to the posts found and schedule the next poll; returns how many were new.
+
+        Returns None when there is nothing to compare with yet, which leaves the interval unchanged.
+        """
+        urls = set(urls)
+        new_items = None if self.known_urls is None else len(urls - self.known_urls)
+        if new_items:
+            self.interval = max(MIN_INTERVAL_SECONDS, self.interval * SPEEDUP_FACTOR)
+        elif new_items == 0:
+            self.interval = min(MAX_INTERVAL_SECONDS, self.interval * SLOWDOWN_FACTOR)
+        self.known_urls = urls
+        self.failures = 0
+        self.next_run_at = now + self.interval * random.uniform(1.0, 1.0 + INTERVAL_JITTER)
+        return new_items
+
+    def record_failure(self, now: float) -> float:
+        """Schedule a retry with exponential backoff; returns the delay in seconds."""
+        self.failures += 1
+        backoff = min(MAX_FAILURE_BACKOFF_SECONDS, FAILURE_BACKOFF_SECONDS * 2 ** min(self.failures - 1, 16))
+        # Equal jitter: at least half the backoff, so failing sources still back off but do not retry in lockstep.
+        delay = random.uniform(backoff / 2, backoff)
+        self.next_run_at = now + delay
+        return delay
+
+
+def load_schedules(names: list[str]) -> dict[str, SourceSchedule]:
+    """Return a schedule per source, starting from the intervals learned by earlier daemon runs.
+
+    Every source is due immediately, so the first pass rebuilds the in-memory records of all of them.
+    """
+    try:
+        saved = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        saved = {}
+    schedules = {}
+    for name in names:
+        entry = saved.get(name) or {}
+        schedules[name] = SourceSchedule(name, entry.get("interval", DEFAULT_INTERVAL_SECONDS), entry.get("known_urls"))
+    return schedules
+
+
+def save_schedules(schedules: dict[str, SourceSchedule]) -> None:
+    state = {
+        name: {
+            "interval": round(schedule.interval, 1),
+            "known_urls": sorted(schedule.known_urls) if schedule.known_urls is not None else None,
+        }
+        for name, schedule in schedules.items()
+    }
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_name(f"{STATE_PATH.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(tmp_path, STATE_PATH)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import importlib
+import json
+from collections.abc import Collection
+from pathlib import Path
+from types import ModuleType
+
+import feed_record
+import rss_source
+
+CONFIG_PATH = Path(__file__).resolve().with_name("sources.json")
+
+
+class ModuleSource:
+    """A source with its own scraper module; the module is imported the first time it is needed."""
+
+    def __init__(self, name: str, module_name: str) -> None:
+        self.name = name
+        self.module_name = module_name
+
+    @property
+    def module(self) -> ModuleType:
+        return importlib.import_module(self.module_name)
+
+    def run(self, fields: Collection[str] | None = None) -> list[feed_record.Record]:
+        return self.module.run(fields)
+
+
+def _build(entry: dict, config_path: Path) -> ModuleSource | rss_source.RssSource:
+    name = entry.get("name")
+    source_type = entry.get("type")
+    try:
+        if source_type == "module":
+            return ModuleSource(name, entry["module"])
+        if source_type == "rss":
+            return rss_source.RssSource(name, entry["feed_url"], entry.get("feed_name", f"{name} feed"), entry.get("content"))
+    except KeyError as exc:
+        raise RuntimeError(f"Source {name!r} in {config_path} is missing {exc.args[0]!r}") from None
+    except ValueError as exc:
+        raise RuntimeError(f"Source {name!r} in {config_path}: {exc}") from None
+    raise RuntimeError(f"Source {name!r} in {config_path} has unknown type {source_type!r} (expected 'module' or 'rss')")
+
+
+def load_sources(config_path: Path = CONFIG_PATH, selected: list[str] | None = None) -> list[ModuleSource | rss_source.RssSource]:
+    """Return the enabled sources from the config in file order, or only the `selected` names.
+
+    Nothing is imported for sources that are not returned. A selected name that is not configured is an error.
+    """
+    try:
+        config = json.loads(config_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise RuntimeError(f"Could not read source config {config_path}: {exc}") from exc
+
+    entries = config.get("sources", [])
+    names = [entry.get("name") for entry in entries]
+    if any(not isinstance(name, str) or not name for name in names) or len(set(names)) != len(names):
+        raise RuntimeError(f"Every source in {config_path} needs a unique name")
+    if selected:
+        unknown = sorted(set(selected) - set(names))
+        if unknown:
+            raise RuntimeError(f"Unknown source(s): {', '.join(unknown)}. Configured: {', '.join(names)}")
+        # Explicitly selected sources run even when the config disables them.
+        entries = [entry for entry in entries if entry["name"] in selected]
+    else:
+        entries = [entry for entry in entries if entry.get("enabled", True)]
+    return [_build(entry, config_path) for entry in entries]
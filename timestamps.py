@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+from datetime import date, datetime, time, timedelta, timezone
+
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Naive, so that utc_iso strings parsed without their "Z" can be subtracted from it directly.
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+
+def utc_iso(value: datetime | date) -> str:
+    """Format as ISO-8601 UTC, e.g. "2025-01-31T09:30:00Z"; naive datetimes and bare dates count as UTC.
+
+    The fixed width means these strings sort chronologically as plain text.
+    """
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime(ISO_UTC_FORMAT)
+
+
+def utc_seconds(iso_text: str) -> int:
+    """Parse a utc_iso string back into integer seconds since the epoch."""
+    return (datetime.fromisoformat(iso_text[:-1]) - EPOCH) // ONE_SECOND
+
+
+def utc_iso_from_seconds(seconds: int) -> str:
+    return (EPOCH + timedelta(seconds=seconds)).isoformat() + "Z"
@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
-import html
+import bisect
 import re
-from datetime import date, datetime, timedelta
+from collections.abc import Collection
+from datetime import date, datetime
 from urllib.parse import urljoin
-from urllib.request import Request, urlopen
+
+import backfill
+import crawl_state
+import extraction_cache
+import feed_record
+import fetch_stage
+import html_text
+import http_cache
+import metrics
+import timestamps
 
 BASE_URL = "https://x.ai"
 NEWS_URL = f"{BASE_URL}/news"
@@ -12,27 +22,35 @@ REQUEST_TIMEOUT_SECONDS = 30
 WINDOW_DAYS = 30
 
 OUTPUT_BASENAME = "xai_news_feed"
-FIELDS = ["title", "url", "date", "content"]
+FIELDS = ["title", "url", "date", "published_at", "content"]
+# Bump when _extract_article_content changes so cached extractions are redone.
+EXTRACTOR_VERSION = 2
+# Stop reading an article page at the end of its <article>/<main> region, or after this many bytes.
+ARTICLE_MAX_BYTES = 2 * 1024 * 1024
 
 LINK_PATTERN = re.compile(r'<a[^>]+href="(/news/[^"#?]+)"[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
 DATE_PATTERN = re.compile(r"\b([A-Z][a-z]+ \d{2}, \d{4})\b")
+# A link only takes a date that lies entirely within this many characters of its start.
+DATE_SEARCH_RADIUS = 1200
+
 
+def _fetch_html(url: str, policy: http_cache.CachePolicy = http_cache.FEED_POLICY) -> str:
+    return http_cache.fetch_text(url, USER_AGENT, REQUEST_TIMEOUT_SECONDS, policy)
 
-def _fetch_html(url: str) -> str:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
-        return response.read().decode("utf-8", errors="replace")
+
+def _fetch_article(url: str) -> str:
+    return http_cache.fetch_text(
+        url,
+        USER_AGENT,
+        REQUEST_TIMEOUT_SECONDS,
+        http_cache.ARTICLE_POLICY,
+        stop_at=html_text.ArticleRegionEnd,
+        max_body_bytes=ARTICLE_MAX_BYTES,
+    )
 
 
 def _clean_text(text: str) -> str:
-    text = html.unescape(text)
-    text = re.sub(r"(?is)<br\s*/?>", "\n", text)
-    text = re.sub(r"(?is)</(p|div|li|h1|h2|h3|h4|h5|h6|tr|ul|ol|blockquote|section|article)>", "\n", text)
-    text = re.sub(r"(?is)<[^>]+>", " ", text)
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+    return html_text.html_to_text(text, html_text.ARTICLE_BLOCK_TAGS)
 
 
 def _parse_xai_date(date_text: str) -> date | None:
@@ -46,29 +64,41 @@ def _in_last_window(date_text: str) -> bool:
     published_day = _parse_xai_date(date_text)
     if published_day is None:
         return False
-    end_day = date.today()
-    start_day = end_day - timedelta(days=WINDOW_DAYS - 1)
+    start_day, end_day = backfill.window_bounds(WINDOW_DAYS)
     return start_day <= published_day <= end_day
 
 
-def _find_nearest_date(html_text: str, anchor_index: int) -> str:
-    window_start = max(0, anchor_index - 1200)
-    window_end = min(len(html_text), anchor_index + 1200)
-    window = html_text[window_start:window_end]
+def _reaches_window_start(news_html: str) -> bool:
+    """Whether the page lists any post older than the window, so older pages need not be fetched."""
+    start_day, _ = backfill.window_bounds(WINDOW_DAYS)
+    published_days = (_parse_xai_date(match.group(1)) for match in DATE_PATTERN.finditer(news_html))
+    return any(published_day is not None and published_day < start_day for published_day in published_days)
+
 
+def _index_dates(news_html: str) -> tuple[list[int], list[re.Match[str]]]:
+    date_matches = list(DATE_PATTERN.finditer(news_html))
+    return [match.start() for match in date_matches], date_matches
+
+
+def _find_nearest_date(date_starts: list[int], date_matches: list[re.Match[str]], anchor_index: int) -> str:
+    # Only the closest date on either side of the anchor can win; on a tie the earlier one does.
+    position = bisect.bisect_left(date_starts, anchor_index)
     best_date = ""
-    best_distance = 10**9
-    for match in DATE_PATTERN.finditer(window):
-        distance = abs((window_start + match.start()) - anchor_index)
-        if distance < best_distance:
-            best_distance = distance
-            best_date = match.group(1)
+    best_distance = DATE_SEARCH_RADIUS + 1
+
+    if position > 0 and date_starts[position - 1] >= anchor_index - DATE_SEARCH_RADIUS:
+        best_distance = anchor_index - date_starts[position - 1]
+        best_date = date_matches[position - 1].group(1)
+    if position < len(date_matches) and date_matches[position].end() <= anchor_index + DATE_SEARCH_RADIUS:
+        if date_starts[position] - anchor_index < best_distance:
+            best_date = date_matches[position].group(1)
     return best_date
 
 
-def _parse_listing(news_html: str) -> list[dict[str, str]]:
-    posts: list[dict[str, str]] = []
+def _parse_listing(news_html: str) -> list[feed_record.Record]:
+    posts: list[feed_record.Record] = []
     seen_urls: set[str] = set()
+    date_starts, date_matches = _index_dates(news_html)
 
     for match in LINK_PATTERN.finditer(news_html):
         relative_url = match.group(1).strip()
@@ -83,12 +113,12 @@ def _parse_listing(news_html: str) -> list[dict[str, str]]:
         if url in seen_urls:
             continue
 
-        date_text = _find_nearest_date(news_html, match.start())
+        date_text = _find_nearest_date(date_starts, date_matches, match.start())
         if not date_text or not _in_last_window(date_text):
             continue
 
         seen_urls.add(url)
-        posts.append({"title": title, "url": url, "date": date_text})
+        posts.append(feed_record.Record("xai_news", title, url, date_text, timestamps.utc_iso(_parse_xai_date(date_text))))
 
     if not posts:
         return []
@@ -98,22 +128,7 @@ def _parse_listing(news_html: str) -> list[dict[str, str]]:
 
 
 def _extract_article_content(article_html: str) -> str:
-    html_text = article_html
-    lower = html_text.lower()
-
-    article_start = lower.find("<article")
-    if article_start != -1:
-        article_end = lower.find("</article>", article_start)
-        html_text = html_text[article_start : article_end + len("</article>")] if article_end != -1 else html_text[article_start:]
-    else:
-        main_start = lower.find("<main")
-        if main_start != -1:
-            main_end = lower.find("</main>", main_start)
-            html_text = html_text[main_start : main_end + len("</main>")] if main_end != -1 else html_text[main_start:]
-
-    html_text = re.sub(r"(?is)<(script|style|noscript|svg).*?>.*?</\1>", " ", html_text)
-    html_text = re.sub(r"(?is)<!--.*?-->", " ", html_text)
-    text = _clean_text(html_text)
+    text = html_text.html_to_text(html_text.article_region(article_html), html_text.ARTICLE_BLOCK_TAGS, skip_hidden=True)
 
     # Trim obvious site chrome if present after article content.
     for marker in ("Try Grok On", "Products", "Resources", "Privacy policy"):
@@ -125,17 +140,54 @@ def _extract_article_content(article_html: str) -> str:
     return text
 
 
-def run() -> list[dict[str, str]]:
-    news_html = _fetch_html(NEWS_URL)
-    posts = _parse_listing(news_html)
+def run(fields: Collection[str] | None = None) -> list[feed_record.Record]:
+    with metrics.stage("xai_news", "fetch"):
+        news_html = _fetch_html(NEWS_URL)
+    with metrics.stage("xai_news", "parse"):
+        posts = _parse_listing(news_html)
+        if backfill.RANGE is not None and not _reaches_window_start(news_html):
+            seen_urls = {post.url for post in posts}
+            for page_html in backfill.older_pages(NEWS_URL, news_html, _fetch_html, "xai_news"):
+                for post in _parse_listing(page_html):
+                    if post.url not in seen_urls:
+                        seen_urls.add(post.url)
+                        posts.append(post)
+                if _reaches_window_start(page_html):
+                    break
 
     if not posts:
-        raise RuntimeError(f"No xAI news posts found in the last {WINDOW_DAYS} days.")
-
-    for index, post in enumerate(posts, start=1):
-        print(f"[xai_news] [{index}/{len(posts)}] Fetching content: {post['url']}")
-        article_html = _fetch_html(post["url"])
-        post["content"] = _extract_article_content(article_html)
+        raise RuntimeError(f"No xAI news posts found {backfill.window_label(WINDOW_DAYS)}.")
+
+    if fields is not None and "content" not in fields:
+        print(f"[xai_news] Metadata only: {len(posts)} posts, article pages skipped")
+        return posts
+
+    state = crawl_state.CrawlState("xai_news")
+    pending: list[tuple[feed_record.Record, str]] = []
+    for post in posts:
+        post_fingerprint = crawl_state.fingerprint(post.title, post.date)
+        stored_content = state.lookup(post.url, post_fingerprint)
+        if stored_content is None:
+            pending.append((post, post_fingerprint))
+        else:
+            post.content = stored_content
+    print(f"[xai_news] Reusing {len(posts) - len(pending)} stored articles, fetching {len(pending)}")
+
+    with metrics.stage("xai_news", "fetch"):
+        article_pages = fetch_stage.fetch_pages(
+            [post.url for post, _ in pending],
+            _fetch_article,
+            "xai_news",
+        )
+    article_contents = extraction_cache.extract_many("xai_news", EXTRACTOR_VERSION, article_pages, _extract_article_content)
+    for (post, post_fingerprint), article_content in zip(pending, article_contents):
+        if article_content is None:
+            # Leave the content empty and retry the page on the next run.
+            post.content = ""
+            continue
+        post.content = article_content
+        state.remember(post.url, post_fingerprint, post.content)
+    state.save()
 
-    print(f"[xai_news] Parsed {len(posts)} posts from last {WINDOW_DAYS} days")
+    print(f"[xai_news] Parsed {len(posts)} posts {backfill.window_label(WINDOW_DAYS)}")
     return posts